@@ -0,0 +1,57 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Voraggregation der bereinigten Daten zu     #
+# einem Würfel Monat x Verkäufer x Region x Produkt         #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import pandas as pd
+from data_cleaning_memory import widen
+
+# Dimensionen und Kennzahlen des Würfels
+CUBE_DIMENSIONS = ['Monat', 'Verkäufer', 'Region', 'Produkt']
+CUBE_MEASURES = {
+    'Gesamtumsatz': ('Gesamtumsatz', 'sum'),
+    'Verkaufte Menge': ('Verkaufte Menge', 'sum'),
+    'Anzahl': ('Gesamtumsatz', 'size'),
+}
+
+
+def build_cube(df):
+    # Berechnung aller Summen und Anzahlen in einem Durchlauf über die Zeilen,
+    # fehlende Dimensionswerte bleiben als eigene Zellen erhalten; Kennzahlen werden in int64/float64
+    # summiert (verkleinerte Zahlentypen würden überlaufen), Kategorien nur mit vorkommenden Werten
+    measures = {column for column, _ in CUBE_MEASURES.values()}
+    frame = df[CUBE_DIMENSIONS].assign(**{column: widen(df[column]) for column in measures})
+    cube = frame.groupby(CUBE_DIMENSIONS, dropna=False, sort=True, observed=True).agg(**CUBE_MEASURES)
+    return cube.reset_index()
+
+
+def rollup(cube, dimensions, measure='Gesamtumsatz'):
+    # Verdichtung des Würfels auf die gewünschten Dimensionen, fehlende Werte werden
+    # wie bei einem groupby über die Rohdaten ausgelassen
+    return cube.groupby(dimensions, observed=True)[measure].sum()
+
+
+def monthly_totals(cube, column=None, measure='Gesamtumsatz'):
+    # Monatssummen, optional aufgeteilt nach einer weiteren Dimension (eine Spalte je Wert)
+    if column is None:
+        return rollup(cube, ['Monat'], measure)
+    return rollup(cube, ['Monat', column], measure).unstack()
+
+
+def merge_cubes(*cubes):
+    # Zusammenführen mehrerer Würfel (z. B. bisheriger Stand und neu hinzugekommene Zeilen),
+    # gleiche Zellen werden addiert; leere Teilwürfel (None) werden übersprungen
+    cubes = [cube for cube in cubes if cube is not None]
+    combined = cubes[0] if len(cubes) == 1 else pd.concat(cubes, ignore_index=True)
+    merged = combined.groupby(CUBE_DIMENSIONS, dropna=False, sort=True, observed=True)[list(CUBE_MEASURES)].sum()
+    return merged.reset_index()
+
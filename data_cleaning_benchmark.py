@@ -0,0 +1,239 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Benchmark aller Schritte von Bereinigung    #
+# und Reporting mit synthetischen Verkaufsdaten             #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import matplotlib
+import numpy as np
+import pandas as pd
+
+# Diagramme ohne Bildschirm rendern, der Benchmark läuft auch auf Build-Servern
+matplotlib.use('Agg')
+
+from data_cleaning_tool import DataCleaningApp  # noqa: E402
+import data_cleaning_aggregation  # noqa: E402
+from data_cleaning_rules import DEFAULT_CONFIG  # noqa: E402
+
+# Standardgrößen für den Benchmark
+DEFAULT_ROW_COUNTS = [10_000, 1_000_000, 10_000_000]
+PRODUCTS = ['Apple iPhone 16 Pro Max', 'Samsung Galaxy S24 Ultra', 'Huawei Pura 70 Ultra']
+PRICES = [1449, 1239, 1499]
+DATE_FORMATS = DEFAULT_CONFIG['date_formats']
+SELLERS = DEFAULT_CONFIG['sellers']  # Bekannte Verkäufer mit Region aus den Standardregeln
+
+# Messbare Schritte der Verarbeitung in Ausführungsreihenfolge
+STAGES = ['laden', 'bereinigen', 'aggregation', 'diagramme', 'spaltenbreiten', 'export']
+EXPORT_LIMIT = 100_000  # Excel-Export (openpyxl) nur bis zu dieser Zeilenzahl messen
+DEFAULT_TOLERANCE = 0.2  # Zulässige Verlangsamung gegenüber der Vergleichsmessung
+
+
+def generate_sales_data(rows, seed=42, sellers=len(SELLERS), regions=len(SELLERS),
+                        dirty_date_ratio=2 / 3, duplicate_ratio=0.01, missing_ratio=0.05):
+    # Erzeugung synthetischer, "verschmutzter" Verkaufsdaten im Format der Quelldateien; die ersten
+    # Verkäufer und Regionen stammen aus den Standardregeln, weitere sind dem Tool unbekannt
+    rng = np.random.default_rng(seed)
+    days = pd.date_range('2024-01-01', '2024-12-31').to_numpy()
+    dates = pd.Series(days[rng.integers(0, len(days), rows)])
+
+    # Abweichende Datumsformate und fehlende Datumsangaben
+    iso_format, *dirty_formats = DATE_FORMATS
+    chosen_formats = np.where(rng.random(rows) < dirty_date_ratio,
+                              np.array(dirty_formats)[rng.integers(0, len(dirty_formats), rows)], iso_format)
+    raw_dates = np.empty(rows, dtype=object)
+    for date_format in DATE_FORMATS:
+        mask = chosen_formats == date_format
+        raw_dates[mask] = dates[mask].dt.strftime(date_format).to_numpy()
+    raw_dates[rng.random(rows) < 0.02] = np.nan
+
+    region_names = np.array(_names(list(SELLERS.values()), "REGION", regions), dtype=object)
+    seller_names = np.array(_names(list(SELLERS), "Verkäufer", sellers), dtype=object)
+    seller_index = rng.integers(0, len(seller_names), rows)
+    seller_column = seller_names[seller_index]
+    region_column = region_names[seller_index % len(region_names)]
+
+    # Fehlende Verkäufer bzw. Regionen und abweichende Schreibweisen
+    seller_column[rng.random(rows) < missing_ratio] = np.nan
+    region_column[rng.random(rows) < missing_ratio] = np.nan
+    upper = rng.random(rows) < missing_ratio
+    seller_column[upper] = pd.Series(seller_column[upper], dtype=object).str.upper().to_numpy()
+
+    product_index = rng.integers(0, len(PRODUCTS), rows)
+    quantities = rng.integers(1, 200, rows)
+    prices = np.array(PRICES)[product_index]
+
+    df = pd.DataFrame({
+        'Datum': raw_dates,
+        'Verkäufer': seller_column,
+        'Region': region_column,
+        'Produkt': np.array(PRODUCTS, dtype=object)[product_index],
+        'Verkaufte Menge': quantities,
+        'Umsatz pro Einheit': prices,
+        'Gesamtumsatz': quantities * prices,
+        'Kommentar': np.nan,
+    })
+
+    # Doppelte Einträge anhängen
+    duplicates = df.sample(frac=duplicate_ratio, random_state=seed)
+    return pd.concat([df, duplicates], ignore_index=True)
+
+
+def _names(known, prefix, count):
+    # Namensliste aus bekannten Namen, bei Bedarf ergänzt um durchnummerierte Namen
+    return (known + [f"{prefix} {number}" for number in range(len(known) + 1, count + 1)])[:count]
+
+
+def benchmark_pipeline(df, stages=STAGES, memory=True, export_limit=EXPORT_LIMIT):
+    # Messung von Laufzeit und Speicherspitze je Schritt; die Speicherspitze stammt aus einem
+    # zweiten Durchlauf mit tracemalloc, damit dessen Mehraufwand die Laufzeiten nicht verfälscht
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = os.path.join(temp_dir, 'verkauf.csv')
+        df.to_csv(input_path, index=False)
+        steps = _pipeline_steps(input_path, os.path.join(temp_dir, 'report.xlsx'))
+
+        # Nicht ausgewählte Schritte laufen ungemessen mit, soweit spätere Schritte ihr Ergebnis benötigen
+        last_stage = max(STAGES.index(stage) for stage in stages)
+        state = {}
+        for stage in STAGES[:last_stage + 1]:
+            if stage == 'export' and len(df) > export_limit:
+                results[stage] = None
+                continue
+            if stage not in stages:
+                steps[stage](state)
+                continue
+            results[stage] = _measure(steps[stage], state)
+            if memory:
+                results[stage]['peak_mb'] = _measure_peak(steps[stage], state)
+            results[stage]['rows_per_s'] = len(df) / results[stage]['seconds'] if results[stage]['seconds'] else None
+    return results
+
+
+def _pipeline_steps(input_path, report_path):
+    # Schritte der Verarbeitung, jeder Schritt legt sein Ergebnis für die folgenden im Zustand ab
+    def load(state):
+        state['data'] = DataCleaningApp.read_data(input_path)
+
+    def clean(state):
+        state['cleaned'] = DataCleaningApp.clean_data(state['data'])
+
+    def aggregate(state):
+        state['cube'] = data_cleaning_aggregation.build_cube(state['cleaned'])
+
+    def charts(state):
+        # Ohne Bildzwischenspeicher rendern; PNG-Daten statt Puffer, da openpyxl die Puffer beim Speichern schließt
+        DataCleaningApp.clear_chart_cache()
+        state['images'] = [(image.getvalue(), anchor) for image, anchor in DataCleaningApp.render_charts(state['cube'])]
+
+    def widths(state):
+        state['widths'] = DataCleaningApp._column_widths(state['cleaned'])
+
+    def export(state):
+        images = [(io.BytesIO(image), anchor) for image, anchor in state['images']]
+        DataCleaningApp.export_report(state['cleaned'], report_path, images, column_widths=state['widths'])
+
+    return {'laden': load, 'bereinigen': clean, 'aggregation': aggregate, 'diagramme': charts,
+            'spaltenbreiten': widths, 'export': export}
+
+
+def _measure(step, state):
+    # Laufzeit eines Schritts
+    start = time.perf_counter()
+    step(state)
+    return {'seconds': time.perf_counter() - start}
+
+
+def _measure_peak(step, state):
+    # Speicherspitze eines Schritts in MB (nur Python- und NumPy-Speicher)
+    tracemalloc.start()
+    try:
+        step(dict(state))
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def compare_with_baseline(measurements, baseline, tolerance=DEFAULT_TOLERANCE):
+    # Vergleich mit einer früheren Messung, Rückgabe aller Schritte, die langsamer als erlaubt sind
+    regressions = []
+    for rows, stages in measurements.items():
+        for stage, result in stages.items():
+            previous = baseline.get(rows, {}).get(stage)
+            if result and previous and result['seconds'] > previous['seconds'] * (1 + tolerance):
+                regressions.append(f"{int(rows):,} Zeilen, {stage}: {previous['seconds']:.2f} s -> "
+                                   f"{result['seconds']:.2f} s")
+    return regressions
+
+
+def format_results(rows, results):
+    # Tabellarische Ausgabe der Messung einer Datenmenge
+    lines = [f"{rows:,} Zeilen", f"  {'Schritt':<15}{'Dauer':>10}{'Zeilen/s':>16}{'Speicherspitze':>18}"]
+    for stage, result in results.items():
+        if result is None:
+            lines.append(f"  {stage:<15}{'übersprungen':>10}")
+            continue
+        rate = f"{result['rows_per_s']:,.0f}" if result['rows_per_s'] else "-"
+        peak = f"{result['peak_mb']:,.1f} MB" if 'peak_mb' in result else "-"
+        lines.append(f"  {stage:<15}{result['seconds']:>8.2f} s{rate:>16}{peak:>18}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark der Bereinigung und des Reportings (ohne GUI)")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROW_COUNTS,
+                        help="Anzahl der zu erzeugenden Zeilen je Durchlauf")
+    parser.add_argument("--sellers", type=int, default=len(SELLERS), help="Anzahl unterschiedlicher Verkäufer")
+    parser.add_argument("--regions", type=int, default=len(SELLERS), help="Anzahl unterschiedlicher Regionen")
+    parser.add_argument("--dirty-dates", type=float, default=2 / 3,
+                        help="Anteil der Datumsangaben in abweichenden Formaten (0..1)")
+    parser.add_argument("--duplicates", type=float, default=0.01, help="Anteil zusätzlicher doppelter Zeilen (0..1)")
+    parser.add_argument("--seed", type=int, default=42, help="Startwert des Zufallsgenerators")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="Zu messende Schritte")
+    parser.add_argument("--export-limit", type=int, default=EXPORT_LIMIT,
+                        help="Excel-Export nur bis zu dieser Zeilenzahl messen")
+    parser.add_argument("--no-memory", action="store_true", help="Keine Speicherspitzen messen (halbe Laufzeit)")
+    parser.add_argument("--json", help="Messergebnisse als JSON-Datei speichern")
+    parser.add_argument("--baseline", help="JSON-Datei einer früheren Messung zum Vergleich")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Zulässige Verlangsamung gegenüber der Vergleichsmessung (0.2 = 20%%)")
+    arguments = parser.parse_args(argv)
+
+    measurements = {}
+    for rows in arguments.rows:
+        df = generate_sales_data(rows, arguments.seed, arguments.sellers, arguments.regions,
+                                 arguments.dirty_dates, arguments.duplicates)
+        results = benchmark_pipeline(df, arguments.stages, not arguments.no_memory, arguments.export_limit)
+        measurements[str(rows)] = results
+        print(format_results(len(df), results))
+
+    if arguments.json:
+        with open(arguments.json, 'w', encoding='utf-8') as target:
+            json.dump(measurements, target, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline, encoding='utf-8') as source:
+            regressions = compare_with_baseline(measurements, json.load(source), arguments.tolerance)
+        for regression in regressions:
+            print(f"LANGSAMER  {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Zwischenspeicher bereinigter Daten in einem #
+# kompakten spaltenweisen Binärformat (NumPy .npz)          #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+import data_cleaning_dedup
+import data_cleaning_rules
+
+# Erhöhen, sobald sich Bereinigung oder Format ändern, damit alte Einträge ungültig werden
+CACHE_FORMAT_VERSION = 4
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".data_cleaning_tool", "cache")
+MAX_CACHE_ENTRIES = 50
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Datumsspalten ohne Uhrzeit werden als Tage seit 1970 (int32) gespeichert, fehlende Werte (NaT) als MISSING_DAY
+MISSING_DAY = np.iinfo(np.int32).min
+
+
+def file_digest(file_path):
+    # SHA-256 über den Dateiinhalt, blockweise gelesen
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as source:
+        for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path_for(input_path, cache_dir=None):
+    # Pfad des Cache-Eintrags, abhängig vom Inhalt der Quelldatei, der Formatversion, den Bereinigungsregeln
+    # und den Einstellungen der Duplikaterkennung
+    rules_digest = data_cleaning_rules.load_rules().digest[:12]
+    dedup_digest = data_cleaning_dedup.settings_digest()[:8]
+    key = f"v{CACHE_FORMAT_VERSION}-{rules_digest}-{dedup_digest}-{file_digest(input_path)}"
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, f"{key}.npz")
+
+
+def cube_path_for(cache_path):
+    # Pfad des zugehörigen voraggregierten Würfels neben den bereinigten Daten
+    return f"{cache_path[:-len('.npz')]}.cube.npz"
+
+
+def load_cached(cache_path):
+    # Laden eines Cache-Eintrags, None falls nicht vorhanden oder unlesbar
+    # (auch wenn ein paralleler Lauf den Eintrag zwischen Lesen und Markieren gelöscht hat)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        df = read_frame(cache_path)
+        os.utime(cache_path)  # Zuletzt genutzte Einträge bleiben beim Aufräumen erhalten
+    except (OSError, ValueError, KeyError):
+        return None
+    return df
+
+
+def store_cached(df, cache_path, max_entries=MAX_CACHE_ENTRIES):
+    # Speichern eines Cache-Eintrags, Fehler beim Schreiben brechen die Verarbeitung nicht ab
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        write_frame(df, cache_path)
+        prune_cache(os.path.dirname(cache_path), max_entries)
+    except OSError:
+        return False
+    return True
+
+
+def prune_cache(cache_dir, max_entries=MAX_CACHE_ENTRIES):
+    # Löschen der am längsten nicht genutzten Einträge oberhalb der Höchstanzahl samt zugehörigem Würfel
+    entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+               if name.endswith(".npz") and not name.endswith(".cube.npz")]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[max_entries:]:
+        for entry_path in (path, cube_path_for(path)):
+            if os.path.exists(entry_path):
+                os.remove(entry_path)
+
+
+def write_frame(df, path):
+    # Spaltenweises Schreiben: Texte als Kategorien (Codes + Werte), Datum als Tage, Monat als Periodennummer
+    arrays = {'index': df.index.to_numpy()}
+    columns = []
+    for position, (name, series) in enumerate(df.items()):
+        key = f"c{position}"
+        kind = _encode_column(series, key, arrays)
+        columns.append({'name': name, 'kind': kind, 'key': key})
+    arrays['meta'] = np.array(json.dumps({'columns': columns}))
+
+    # Atomares Ersetzen, damit parallele Läufe (Prozesse oder Threads) nie einen halb geschriebenen Eintrag lesen
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as target:
+        np.savez(target, **arrays)
+    os.replace(temp_path, path)
+
+
+def read_frame(path):
+    # Lesen eines mit write_frame geschriebenen Eintrags als DataFrame
+    # (Pickle nur für gemischt typisierte Textspalten aus dem eigenen Cache-Verzeichnis)
+    with np.load(path, allow_pickle=True) as archive:
+        meta = json.loads(archive['meta'].item())
+        data = {column['name']: _decode_column(column, archive) for column in meta['columns']}
+        return pd.DataFrame(data, index=archive['index'])
+
+
+def _encode_column(series, key, arrays):
+    # Kodierung einer Spalte, Rückgabe der Spaltenart für das Lesen
+    if isinstance(series.dtype, pd.PeriodDtype):
+        arrays[key] = series.array.asi8
+        arrays[f"{key}_dtype"] = np.array(str(series.dtype))
+        return 'period'
+    if pd.api.types.is_datetime64_dtype(series.dtype):
+        # Reine Datumswerte als Tage (4 statt 8 Bytes je Zeile), Zeitpunkte mit Uhrzeit unverändert
+        values = series.to_numpy(dtype='datetime64[ns]')
+        days = values.astype('datetime64[D]')
+        missing = np.isnat(values)
+        if ((days == values) | missing).all():
+            arrays[key] = np.where(missing, MISSING_DAY, days.astype(np.int64)).astype(np.int32)
+            arrays[f"{key}_dtype"] = np.array(str(series.dtype))
+            return 'date'
+        arrays[key] = values
+        return 'datetime'
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return _encode_categories(series.cat.codes.to_numpy(), series.cat.categories, key, arrays, 'categorical')
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        arrays[key] = series.to_numpy()
+        return 'numeric'
+
+    codes, categories = pd.factorize(series)
+    if all(isinstance(value, str) for value in categories):
+        return _encode_categories(codes, categories, key, arrays, 'category')
+    arrays[key] = series.to_numpy(dtype=object)
+    return 'object'
+
+
+def _encode_categories(codes, categories, key, arrays, kind):
+    # Speicherung kategorialer Werte als kleinste passende Codes plus Werteliste
+    dtype = np.int16 if len(categories) < np.iinfo(np.int16).max else np.int32
+    arrays[key] = codes.astype(dtype)
+    arrays[f"{key}_categories"] = np.asarray(categories, dtype=str)
+    return kind
+
+
+def _decode_column(column, archive):
+    # Rückumwandlung einer Spalte in die Darstellung von clean_data
+    kind, key = column['kind'], column['key']
+    values = archive[key]
+    if kind == 'period':
+        dtype = pd.api.types.pandas_dtype(archive[f"{key}_dtype"].item())
+        return pd.PeriodIndex.from_ordinals(values, freq=dtype.freq)
+    if kind == 'categorical':
+        return pd.Categorical.from_codes(values, categories=archive[f"{key}_categories"])
+    if kind == 'category':
+        lookup = np.append(archive[f"{key}_categories"].astype(object), np.nan)
+        return lookup[values]
+    if kind == 'date':
+        dates = values.astype('datetime64[D]')
+        dates[values == MISSING_DAY] = np.datetime64('NaT')
+        return dates.astype(archive[f"{key}_dtype"].item())
+    return values
@@ -0,0 +1,335 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Kommandozeilen-Stapelverarbeitung ohne GUI, #
+# mehrere Dateien parallel in einem Prozesspool             #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Diagramme ohne Bildschirm rendern, gilt auch für die Prozesse des Pools
+# (Umgebungsvariable statt matplotlib.use, damit matplotlib erst bei Bedarf geladen wird)
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from data_cleaning_tool import DataCleaningApp, CHUNK_SIZE, DEFAULT_REPORT, REPORTS  # noqa: E402
+import data_cleaning_cache  # noqa: E402
+import data_cleaning_dedup  # noqa: E402
+import data_cleaning_excel  # noqa: E402
+import data_cleaning_incremental  # noqa: E402
+import data_cleaning_memory  # noqa: E402
+import data_cleaning_rules  # noqa: E402
+import data_cleaning_telemetry  # noqa: E402
+
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx')
+OUTPUT_SUFFIX = "_bereinigt"
+DEFAULT_OUTPUT_DIR = "bereinigt"
+
+
+def collect_input_files(patterns):
+    # Auflösung von Dateien, Verzeichnissen und Glob-Mustern zu einer sortierten Dateiliste
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            candidates = glob.glob(pattern)
+        files.update(path for path in candidates if path.lower().endswith(SUPPORTED_EXTENSIONS))
+    return sorted(files)
+
+
+def output_path_for(input_path, output_dir, extension=".xlsx"):
+    # Zielpfad der bereinigten Datei im Ausgabeverzeichnis
+    name = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, f"{name}{OUTPUT_SUFFIX}{extension}")
+
+
+def process_file(input_path, output_dir, chunk_size=None, cache_dir=None, use_cache=True, report=DEFAULT_REPORT,
+                 incremental=False, key_index=None):
+    # Bereinigen, Speichern und Diagrammerstellung für eine Datei mit Messwerten je Schritt (Dauer, Zeilen,
+    # Speicher; Teilschritte der Bereinigung und des Reports) im Protokoll result['run_log'];
+    # key_index: Schlüsselindex für Duplikate über mehrere Dateien und Läufe (ohne Zwischenspeicher)
+    start = time.perf_counter()
+    run_log = data_cleaning_telemetry.RunLog(input_path, report)
+    cached = False
+    date_reports = {}
+    duplicates = None
+    memory = None
+    use_cache = use_cache and key_index is None
+
+    if incremental and input_path.lower().endswith('.csv'):
+        # Fortlaufend ergänzte CSV-Exporte: nur die seit dem letzten Lauf angehängten Zeilen verarbeiten
+        output_path = output_path_for(input_path, output_dir)
+        with run_log.stage('inkrementell') as stage:
+            update = data_cleaning_incremental.update_report(input_path, output_path, cache_dir, report,
+                                                             chunk_size or CHUNK_SIZE)
+            stage.rows_in, stage.rows_out = update['rows_in'], update['rows_out']
+        return {
+            'input': input_path,
+            'output': output_path,
+            'rows_in': update['rows_in'],
+            'rows_out': update['rows_out'],
+            'rows_total': update['rows_total'],
+            'cached': False,
+            'duplicates': update['duplicates'],
+            'timings': update['timings'],
+            'run_log': run_log.to_json(),
+            'duration': time.perf_counter() - start,
+        }
+
+    if chunk_size and input_path.lower().endswith('.csv'):
+        # Speicherschonender Modus: blockweise Bereinigung in eine CSV-Datei, ohne Diagramme
+        output_path = output_path_for(input_path, output_dir, extension=".csv")
+        with run_log.stage('bereinigen') as stage:
+            rows_out, duplicates = DataCleaningApp.clean_csv_in_chunks(input_path, output_path, chunk_size,
+                                                                       key_index=key_index)
+            stage.rows_in, stage.rows_out = duplicates['rows'] if duplicates else 0, rows_out
+        rows_in = None
+    else:
+        output_path = output_path_for(input_path, output_dir)
+        with run_log.stage('laden') as stage:
+            cache_path = data_cleaning_cache.cache_path_for(input_path, cache_dir) if use_cache else None
+            cleaned_data = data_cleaning_cache.load_cached(cache_path) if cache_path else None
+            if cleaned_data is not None:
+                stage.name = 'cache'
+                stage.rows_out = len(cleaned_data)
+            else:
+                data = DataCleaningApp.read_data(input_path)
+                stage.rows_out = len(data)
+
+        if cleaned_data is not None:
+            cached = True
+            rows_in = None
+        else:
+            memory = data.attrs.get('memory')
+            with run_log.stage('bereinigen', len(data)) as stage:
+                cleaned_data = DataCleaningApp.clean_data(data, key_index=key_index)
+                stage.rows_out = len(cleaned_data)
+                run_log.extend(cleaned_data.attrs.get('stages', []))
+            date_reports = cleaned_data.attrs.get('date_reports', {})
+            duplicates = cleaned_data.attrs.get('duplicates')
+            rows_in = len(data)
+            if cache_path:
+                data_cleaning_cache.store_cached(cleaned_data, cache_path)
+
+        _aggregate_and_report(cleaned_data, output_path, report, cache_path, run_log)
+        rows_out = len(cleaned_data)
+
+    return {
+        'input': input_path,
+        'output': output_path,
+        'rows_in': rows_in,
+        'rows_out': rows_out,
+        'cached': cached,
+        'dates': date_reports,
+        'duplicates': duplicates,
+        'memory': memory,
+        'timings': run_log.timings(),
+        'run_log': run_log.to_json(),
+        'duration': time.perf_counter() - start,
+    }
+
+
+def process_workbooks(paths, output_path, report=DEFAULT_REPORT, key_index=None, workers=None):
+    # Alle Blätter mehrerer Excel-Dateien parallel lesen und gemeinsam in einen Report bereinigen,
+    # die Herkunft jeder Zeile steht in der Spalte data_cleaning_excel.SOURCE_COLUMN
+    start = time.perf_counter()
+    run_log = data_cleaning_telemetry.RunLog([os.path.basename(path) for path in paths], report)
+    with run_log.stage('laden') as stage:
+        data = data_cleaning_excel.read_workbooks(paths, workers=workers)
+        stage.rows_out = len(data)
+    sources = data[data_cleaning_excel.SOURCE_COLUMN].nunique() if data_cleaning_excel.SOURCE_COLUMN in data else 1
+
+    with run_log.stage('bereinigen', len(data)) as stage:
+        cleaned_data = DataCleaningApp.clean_data(data, key_index=key_index)
+        stage.rows_out = len(cleaned_data)
+        run_log.extend(cleaned_data.attrs.get('stages', []))
+
+    _aggregate_and_report(cleaned_data, output_path, report, None, run_log)
+
+    return {
+        'input': f"{len(paths)} Excel-Dateien ({sources} Blätter)",
+        'output': output_path,
+        'rows_in': len(data),
+        'rows_out': len(cleaned_data),
+        'cached': False,
+        'dates': cleaned_data.attrs.get('date_reports', {}),
+        'duplicates': cleaned_data.attrs.get('duplicates'),
+        'memory': data.attrs.get('memory'),
+        'timings': run_log.timings(),
+        'run_log': run_log.to_json(),
+        'duration': time.perf_counter() - start,
+    }
+
+
+def _aggregate_and_report(cleaned_data, output_path, report, cache_path, run_log):
+    # Würfel (aus dem Cache oder neu berechnet) und Excel-Report mit Diagrammen, gemessen im Protokoll
+    with run_log.stage('aggregation', len(cleaned_data)) as stage:
+        cube = DataCleaningApp.load_or_build_cube(cleaned_data, cache_path)
+        stage.details = {'aggregates': len(cube)}  # Würfelzeilen, keine entfernten Zeilen
+    with run_log.stage('report', len(cleaned_data)):
+        DataCleaningApp.write_report(cleaned_data, output_path, report=report, cube=cube, run_log=run_log)
+
+
+def format_result(result):
+    # Einzeilige Ausgabe des Ergebnisses einer Datei
+    name = os.path.basename(result['input'])
+    if 'error' in result:
+        return f"FEHLER  {name}: {result['error']}"
+    steps = ", ".join(f"{step} {seconds:.2f} s" for step, seconds in result['timings'].items())
+    rows_in = "-" if result['rows_in'] is None else f"{result['rows_in']:,}"
+    source = " aus Cache" if result['cached'] else ""
+    if 'rows_total' in result:
+        source = f" neu, gesamt {result['rows_total']:,}"
+    unparseable = sum(report['unparseable'] for report in result.get('dates', {}).values())
+    if unparseable:
+        source += f", {unparseable:,} Datumsangaben nicht erkannt"
+    duplicates = result.get('duplicates')
+    if duplicates and duplicates['duplicates'] + duplicates['known']:
+        source += f", {data_cleaning_dedup.describe_report(duplicates)}"
+    if result.get('memory'):
+        source += f", {data_cleaning_memory.describe_memory(result['memory'])}"
+    return (f"OK      {name}: {rows_in} -> {result['rows_out']:,} Zeilen{source} in {result['duration']:.2f} s "
+            f"({steps})")
+
+
+def format_summary(results, wall_time):
+    # Zusammenfassung des Durchsatzes über alle Dateien
+    succeeded = [result for result in results if 'error' not in result]
+    rows = sum(result['rows_in'] or result['rows_out'] for result in succeeded)
+    throughput = rows / wall_time if wall_time else 0.0
+    return (f"{len(succeeded)} von {len(results)} Dateien verarbeitet, {rows:,} Zeilen in {wall_time:.2f} s "
+            f"({throughput:,.0f} Zeilen/s)")
+
+
+def report_result(result, arguments):
+    # Ausgabe des Ergebnisses einer Datei und Eintrag der Messwerte im JSON-Protokoll
+    print(format_result(result))
+    if 'run_log' in result and not arguments.no_run_log:
+        data_cleaning_telemetry.append_run_log(dict(result['run_log'], duration=result['duration']),
+                                               arguments.run_log)
+
+
+def process_files_with_keys(files, arguments):
+    # Dateiübergreifende Duplikaterkennung: Dateien nacheinander im Hauptprozess, damit die erste Datei
+    # (in sortierter Reihenfolge) eine Zeile behält; Schlüssel einer fehlerhaften Datei werden verworfen
+    key_index = data_cleaning_dedup.KeyIndex.load(arguments.dedup_keys)
+    results = []
+    for path in files:
+        known_keys = key_index.keys
+        try:
+            result = process_file(path, arguments.output_dir, arguments.chunk_size, arguments.cache_dir, False,
+                                  arguments.report, key_index=key_index)
+        except Exception as error:
+            key_index.keys = known_keys
+            result = {'input': path, 'error': f"{type(error).__name__}: {error}"}
+        results.append(result)
+        report_result(result, arguments)
+    key_index.save(arguments.dedup_keys)
+    return results
+
+
+def process_combined(files, arguments):
+    # Gemeinsamer Report aller Excel-Dateien, optional mit dateiübergreifendem Schlüsselindex
+    key_index = data_cleaning_dedup.KeyIndex.load(arguments.dedup_keys) if arguments.dedup_keys else None
+    try:
+        result = process_workbooks(files, output_path_for(arguments.combine, arguments.output_dir), arguments.report,
+                                   key_index, arguments.workers)
+    except Exception as error:
+        result = {'input': arguments.combine, 'error': f"{type(error).__name__}: {error}"}
+    else:
+        if key_index is not None:
+            key_index.save(arguments.dedup_keys)
+    report_result(result, arguments)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stapelverarbeitung des Data Cleaning Tools ohne GUI")
+    parser.add_argument("inputs", nargs="+", help="CSV-/Excel-Dateien, Verzeichnisse oder Glob-Muster")
+    parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR, help="Ausgabeverzeichnis")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="Anzahl paralleler Prozesse")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="CSV-Dateien blockweise mit N Zeilen bereinigen (CSV-Ausgabe ohne Diagramme)")
+    parser.add_argument("--cache-dir", default=None, help="Verzeichnis für zwischengespeicherte bereinigte Daten")
+    parser.add_argument("--no-cache", action="store_true", help="Zwischenspeicher nicht verwenden")
+    parser.add_argument("--report", choices=list(REPORTS), default=DEFAULT_REPORT, help="Reporting mit Diagrammen")
+    parser.add_argument("--incremental", action="store_true",
+                        help="CSV-Dateien inkrementell verarbeiten: nur seit dem letzten Lauf angehängte Zeilen")
+    parser.add_argument("--rules", default=None,
+                        help="JSON-Datei mit Bereinigungsregeln (Standard: ~/.data_cleaning_tool/rules.json)")
+    parser.add_argument("--dedup-keys", default=None,
+                        help="Datei mit Duplikatschlüsseln: Duplikate über alle Dateien und Läufe hinweg entfernen "
+                             "(Dateien nacheinander in sortierter Reihenfolge, ohne Zwischenspeicher)")
+    parser.add_argument("--combine", metavar="NAME", default=None,
+                        help="Alle Blätter aller Excel-Dateien parallel lesen und in einen gemeinsamen Report NAME "
+                             "bereinigen (mit Spalte Quelle für Datei und Blatt)")
+    parser.add_argument("--run-log", default=data_cleaning_telemetry.RUN_LOG_PATH,
+                        help="JSON-Protokoll mit Messwerten je Schritt, eine Zeile je Datei "
+                             "(Standard: ~/.data_cleaning_tool/runs.jsonl)")
+    parser.add_argument("--no-run-log", action="store_true", help="Kein JSON-Protokoll schreiben")
+    arguments = parser.parse_args(argv)
+    if arguments.incremental and arguments.no_cache:
+        parser.error("--incremental benötigt den Zwischenspeicher und ist nicht mit --no-cache kombinierbar.")
+    if arguments.incremental and arguments.dedup_keys:
+        parser.error("--incremental verwaltet eigene Duplikatschlüssel und ist nicht mit --dedup-keys kombinierbar.")
+    if arguments.combine and (arguments.incremental or arguments.chunk_size):
+        parser.error("--combine ist nicht mit --incremental oder --chunk-size kombinierbar.")
+    if arguments.rules:
+        # Regeln vorab prüfen, die Prozesse des Pools übernehmen den Pfad aus der Umgebungsvariable
+        try:
+            data_cleaning_rules.load_rules(arguments.rules)
+        except (OSError, ValueError, KeyError) as error:
+            parser.error(f"Bereinigungsregeln aus {arguments.rules} ungültig: {error}")
+        os.environ[data_cleaning_rules.RULES_ENV_VAR] = os.path.abspath(arguments.rules)
+
+    files = collect_input_files(arguments.inputs)
+    if not files:
+        parser.error("Keine CSV- oder Excel-Dateien gefunden.")
+    os.makedirs(arguments.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    if arguments.combine:
+        if not all(path.lower().endswith('.xlsx') for path in files):
+            parser.error("--combine verarbeitet nur Excel-Dateien.")
+        results = [process_combined(files, arguments)]
+        print(format_summary(results, time.perf_counter() - start))
+        return 1 if any('error' in result for result in results) else 0
+    if arguments.dedup_keys:
+        results = process_files_with_keys(files, arguments)
+        print(format_summary(results, time.perf_counter() - start))
+        return 1 if any('error' in result for result in results) else 0
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max(1, min(arguments.workers, len(files)))) as executor:
+        futures = {
+            executor.submit(process_file, path, arguments.output_dir, arguments.chunk_size,
+                            arguments.cache_dir, not arguments.no_cache, arguments.report,
+                            arguments.incremental): path
+            for path in files
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as error:
+                result = {'input': futures[future], 'error': f"{type(error).__name__}: {error}"}
+            results.append(result)
+            report_result(result, arguments)
+
+    print(format_summary(results, time.perf_counter() - start))
+    return 1 if any('error' in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Parsen gemischter Datumsformate mit Format- #
+# erkennung, Zwischenspeicher und Bericht je Format         #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import threading
+import warnings
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+# Bereinigte Datumsangaben als Tagesdatum (datetime64, Uhrzeiten werden abgeschnitten)
+OUTPUT_DTYPE = 'datetime64[ns]'
+
+# Bezeichnungen im Bericht für Werte ohne festes Format
+AUTO_DETECTED = "automatisch"  # einzeln erkannt (z. B. ausgeschriebene Datumsangaben)
+DATE_VALUE = "Datumswert"  # bereits als Datum eingelesen (z. B. aus Excel)
+UNPARSEABLE = "nicht erkannt"
+
+MAX_GUESSES = 3  # Formaterkennungen je Wertemuster, übrige Werte werden einzeln geparst
+MAX_EXAMPLES = 5  # Beispiele nicht erkannter Zeilen im Bericht
+MEMO_SIZE = 100_000  # Zwischengespeicherte Rohwerte, gemeinsam für alle Blöcke, Dateien und Threads
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def parse_dates(dates, formats=()):
+    # Parsen aller Datumswerte einer Spalte als Tagesdatum: jeder unterschiedliche Rohwert wird nur
+    # einmal verarbeitet, zuerst gesammelt mit den konfigurierten Formaten, dann mit den erkannten;
+    # Rückgabe der geparsten Werte (NaT falls leer oder nicht erkannt) und des Berichts je Format
+    codes, uniques = pd.factorize(dates)
+    parsed, labels = _parse_uniques(pd.Series(uniques, dtype=object), tuple(formats))
+    result = np.append(parsed, np.datetime64('NaT'))[codes]  # Code -1 (leer) verweist auf den letzten Eintrag
+    return pd.Series(result, index=dates.index, dtype=OUTPUT_DTYPE), _report(dates, codes, uniques, labels)
+
+
+def _parse_uniques(values, formats):
+    # Geparste Werte und Bezeichnung des verwendeten Formats je unterschiedlichem Rohwert
+    parsed = np.full(len(values), np.datetime64('NaT'), dtype=OUTPUT_DTYPE)
+    labels = np.full(len(values), UNPARSEABLE, dtype=object)
+    is_text = values.map(type).eq(str).to_numpy()
+
+    # Bereits früher geparste Rohwerte
+    with _memo_lock:
+        for position in np.flatnonzero(is_text):
+            known = _memo.get((formats, values.iat[position]))
+            if known is not None:
+                parsed[position], labels[position] = known
+    pending = is_text & (labels == UNPARSEABLE)
+
+    # Konfigurierte Formate, danach die im Rest erkannten Formate, jeweils gesammelt für alle passenden Werte
+    for date_format in formats:
+        pending &= ~_parse_with_format(values, pending, date_format, parsed, labels)
+    if pending.any():
+        unmatched = np.flatnonzero(pending)
+        shapes = _shapes(values[pending])
+        for positions in shapes.groupby(shapes, sort=False).indices.values():
+            pending &= ~_detect_and_parse(values, unmatched[positions], parsed, labels)
+
+    # Übrige Werte einzeln mit automatischer Erkennung, wie bei pd.to_datetime für einen Einzelwert
+    for position in np.flatnonzero(pending | ~is_text):
+        parsed[position] = _parse_single(values.iat[position])
+        if not np.isnat(parsed[position]):
+            labels[position] = AUTO_DETECTED if is_text[position] else DATE_VALUE
+
+    with _memo_lock:
+        if len(_memo) > MEMO_SIZE:
+            _memo.clear()
+        for position in np.flatnonzero(is_text):
+            _memo[(formats, values.iat[position])] = (parsed[position], labels[position])
+    return parsed, labels
+
+
+def _parse_with_format(values, candidates, date_format, parsed, labels):
+    # Gesammeltes Parsen der ausgewählten Werte mit einem Format, Rückgabe der erfolgreich geparsten Werte
+    if not candidates.any():
+        return np.zeros(len(values), dtype=bool)
+    converted = pd.to_datetime(values[candidates], format=date_format, errors='coerce')
+    if converted.dt.tz is not None:
+        converted = converted.dt.tz_localize(None)
+    success = np.zeros(len(values), dtype=bool)
+    success[np.flatnonzero(candidates)[converted.notna().to_numpy()]] = True
+    parsed[success] = converted.dropna().dt.normalize().to_numpy(dtype=OUTPUT_DTYPE)
+    labels[success] = date_format
+    return success
+
+
+def _detect_and_parse(values, positions, parsed, labels):
+    # Formaterkennung für Werte gleichen Musters: das Format wird an einem Wert erkannt und auf alle
+    # Werte angewendet; Tag-vor-Monat-Formate erst nach der Monat-vor-Tag-Variante, wie bei pandas
+    done = np.zeros(len(values), dtype=bool)
+    for _ in range(MAX_GUESSES):
+        remaining = positions[~done[positions]]
+        if not len(remaining):
+            break
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            guessed = guess_datetime_format(values.iat[remaining[0]])
+        if guessed is None:
+            break
+        for date_format in dict.fromkeys([_month_first(guessed), guessed]):
+            candidates = np.zeros(len(values), dtype=bool)
+            candidates[positions] = True
+            done |= _parse_with_format(values, candidates & ~done, date_format, parsed, labels)
+    return done
+
+
+def _month_first(date_format):
+    # Variante eines Formats mit Monat vor Tag (pandas bevorzugt ohne dayfirst den Monat zuerst)
+    if '%d' in date_format and '%m' in date_format and date_format.index('%d') < date_format.index('%m'):
+        return date_format.replace('%d', '\0').replace('%m', '%d').replace('\0', '%m')
+    return date_format
+
+
+def _shapes(values):
+    # Muster je Wert: Ziffern als 9, Buchstaben als a, übrige Zeichen unverändert (z. B. 99/99/9999)
+    return values.str.replace(r'\d', '9', regex=True).str.replace(r'[^\W\d_]', 'a', regex=True)
+
+
+def _parse_single(value):
+    # Parsen eines einzelnen Datumswerts mit automatischer Formaterkennung, NaT falls nicht erkannt
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        try:
+            parsed = pd.Timestamp(pd.to_datetime(value, errors='coerce'))
+        except (ValueError, TypeError):
+            return np.datetime64('NaT')
+    if pd.isna(parsed):
+        return np.datetime64('NaT')
+    if parsed.tzinfo is not None:
+        parsed = parsed.tz_localize(None)
+    return parsed.normalize().to_datetime64()
+
+
+def _report(dates, codes, uniques, labels):
+    # Zeilen je Format, leere und nicht erkannte Zeilen (mit Beispielen aus Zeilennummer und Rohwert)
+    rows = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    counts = pd.Series(rows).groupby(labels, sort=False).sum()
+    unparseable = np.isin(codes, np.flatnonzero(labels == UNPARSEABLE))
+    examples = dates[unparseable].head(MAX_EXAMPLES)
+    return {
+        'formats': {label: int(count) for label, count in counts.items() if label != UNPARSEABLE and count},
+        'missing': int((codes < 0).sum()),
+        'unparseable': int(unparseable.sum()),
+        'examples': [(_row_label(row), str(value)) for row, value in examples.items()],
+    }
+
+
+def _row_label(row):
+    # Zeilenbezeichnung für den Bericht, Zahlen als int (JSON-tauglich)
+    return row.item() if hasattr(row, 'item') else row
+
+
+def describe_report(report):
+    # Einzeilige Beschreibung eines Berichts für Fortschrittsanzeige und Konsole
+    parts = [f"{count:,} {label}" for label, count in sorted(report['formats'].items(), key=lambda item: -item[1])]
+    if report['missing']:
+        parts.append(f"{report['missing']:,} leer")
+    if report['unparseable']:
+        examples = ", ".join(f"Zeile {row}: {value!r}" for row, value in report['examples'])
+        parts.append(f"{report['unparseable']:,} {UNPARSEABLE} ({examples})")
+    return ", ".join(parts) or "keine Datumsangaben"
@@ -0,0 +1,136 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Duplikaterkennung über 64-Bit-Schlüssel     #
+# normalisierter Werte, datei- und laufübergreifend         #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+import data_cleaning_dates
+import data_cleaning_memory
+
+# Regeln, deren Normalisierung schon für die Duplikaterkennung gilt (z. B. 01/25/2024 = 2024-01-25)
+NORMALIZING_RULES = ('parse_dates', 'title_case')
+
+# Erhöhen, sobald sich die Bildung der Schlüssel ändert, damit zwischengespeicherte Ergebnisse ungültig werden
+KEY_VERSION = 1
+
+
+class KeyIndex:
+    # Menge bereits gesehener 64-Bit-Schlüssel (8 Bytes je Zeile), Suche per binärer Suche; optional in einer Datei
+    # gespeichert, um Duplikate über mehrere Dateien und Läufe hinweg zu erkennen. Die Schlüssel liegen in wenigen
+    # sortierten Teilen absteigender Größe, neue Schlüssel werden erst bei ähnlicher Größe zusammengeführt
+    # (viele kleine Blöcke kosten so nicht jedes Mal eine Kopie aller bisherigen Schlüssel)
+    def __init__(self, keys=None):
+        self.runs = [] if keys is None else [np.asarray(keys, dtype=np.uint64)]
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+    @property
+    def keys(self):
+        # Alle Schlüssel sortiert in einem Array
+        if len(self.runs) > 1:
+            self.runs = [np.sort(np.concatenate(self.runs), kind='stable')]
+        return self.runs[0] if self.runs else np.empty(0, dtype=np.uint64)
+
+    @keys.setter
+    def keys(self, keys):
+        self.runs = [np.asarray(keys, dtype=np.uint64)]
+
+    def contains(self, keys):
+        # Prüfung je Schlüssel, ob er bereits enthalten ist
+        found = np.zeros(len(keys), dtype=bool)
+        for run in self.runs:
+            if len(run):
+                positions = np.searchsorted(run, keys)
+                positions[positions == len(run)] = 0
+                found |= run[positions] == keys
+        return found
+
+    def add(self, keys):
+        # Hinzufügen neuer, untereinander eindeutiger und noch nicht enthaltener Schlüssel als eigener Teil;
+        # Zusammenführen, solange der vorherige Teil höchstens doppelt so groß ist (höchstens log2(n) Teile)
+        if not len(keys):
+            return
+        self.runs.append(np.sort(np.asarray(keys, dtype=np.uint64)))
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            last = self.runs.pop()
+            self.runs[-1] = np.sort(np.concatenate((self.runs[-1], last)), kind='stable')  # Mischen zweier Folgen
+
+    @classmethod
+    def load(cls, path):
+        # Laden einer gespeicherten Schlüsselmenge, leer falls die Datei noch nicht existiert
+        return cls(np.load(path)) if os.path.exists(path) else cls()
+
+    def save(self, path):
+        # Atomares Speichern, ein abgebrochener Lauf hinterlässt den vorherigen Stand
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as target:
+            np.save(target, self.keys)
+        os.replace(temp_path, path)
+
+
+def settings_digest():
+    # Prüfsumme der Duplikaterkennung (Schlüsselbildung und normalisierende Regeln) für Cache- und Auftragsschlüssel
+    settings = json.dumps({'version': KEY_VERSION, 'normalizing_rules': NORMALIZING_RULES})
+    return hashlib.sha256(settings.encode('utf-8')).hexdigest()
+
+
+def duplicate_keys(df, rules):
+    # 64-Bit-Schlüssel je Zeile über die normalisierten Duplikatspalten: Datum nach dem Parsen, Namen in
+    # einheitlicher Schreibweise, Zahlen einheitlich als float (gleich in unterschiedlich typisierten Blöcken)
+    normalizers = {rule['column']: rule['rule'] for rule in rules.rules if rule['rule'] in NORMALIZING_RULES}
+    columns = {}
+    for column in rules.duplicate_columns:
+        values = df[column]
+        if normalizers.get(column) == 'parse_dates' and not pd.api.types.is_datetime64_dtype(values.dtype):
+            values = data_cleaning_dates.parse_dates(values, rules.date_formats)[0]
+        elif normalizers.get(column) == 'title_case':
+            values = data_cleaning_memory.title_case(values)
+        elif pd.api.types.is_numeric_dtype(values.dtype):
+            values = values.astype(np.float64)
+        columns[column] = values  # Kategorien werden wie die entsprechenden Texte gehasht
+    return pd.util.hash_pandas_object(pd.DataFrame(columns, index=df.index), index=False).to_numpy()
+
+
+def select_new(keys, key_index=None, seen=None):
+    # Auswahl der ersten Zeile je Schlüssel ohne bereits bekannte Schlüssel; seen: Schlüssel früherer Blöcke
+    # derselben Quelle (zählen als doppelt), key_index: Schlüssel anderer Dateien bzw. früherer Läufe (zählen
+    # als bekannt); neue Schlüssel werden beiden hinzugefügt; Rückgabe der Auswahl und des Berichts
+    first = ~pd.Series(keys).duplicated().to_numpy()
+    if seen is not None:
+        first &= ~seen.contains(keys)
+        seen.add(keys[first])
+    known = key_index.contains(keys) & first if key_index is not None else np.zeros(len(keys), dtype=bool)
+    keep = first & ~known
+    if key_index is not None:
+        key_index.add(keys[keep])
+    report = {'rows': len(keys), 'duplicates': int((~first).sum()), 'known': int(known.sum())}
+    return keep, report
+
+
+def merge_reports(first, second):
+    # Zusammenfassen der Berichte zweier Blöcke derselben Quelle
+    if first is None:
+        return second
+    return {name: first[name] + second[name] for name in first}
+
+
+def describe_report(report):
+    # Einzeilige Beschreibung: doppelte Zeilen innerhalb der Quelle und bereits bekannte Zeilen
+    text = f"{report['duplicates'] + report['known']:,} doppelte Zeilen entfernt"
+    if report['known']:
+        text += f" (davon {report['known']:,} aus anderen Dateien oder früheren Läufen)"
+    return text
@@ -0,0 +1,111 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Paralleles Einlesen aller Blätter mehrerer  #
+# Excel-Dateien mit Spalte für die Herkunft jeder Zeile     #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+import data_cleaning_memory
+
+# Spalte mit Datei und Blatt jeder Zeile, wenn mehr als ein Blatt gelesen wird
+SOURCE_COLUMN = "Quelle"
+
+# Prozesse zum parallelen Lesen der Blätter (openpyxl parst in reinem Python, Threads bringen keinen Gewinn)
+EXCEL_WORKERS = os.cpu_count() or 1
+
+
+def source_label(path, sheet_name):
+    # Herkunft einer Zeile: Dateiname und Blatt
+    return f"{os.path.basename(path)} / {sheet_name}"
+
+
+def list_sheets(path):
+    # Namen aller Blätter einer Excel-Datei (nur das Inhaltsverzeichnis wird gelesen)
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def read_sheet(path, sheet_name):
+    # Streamendes Lesen eines Blatts (read-only, Zeile für Zeile) mit der ersten Zeile als Überschrift;
+    # leere Zeilen werden übersprungen, Rückgabe None für ein leeres Blatt (kompaktes Schema erst nach dem
+    # Zusammenfügen, damit der Speicherbericht die ungekürzten Daten misst)
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        columns = list(header or ())
+        while columns and columns[-1] is None:
+            columns.pop()
+        if not columns:
+            return None
+        width = len(columns)
+        data = [row[:width] for row in rows if any(value is not None for value in row)]
+    finally:
+        workbook.close()
+    return pd.DataFrame(data, columns=columns)
+
+
+def read_workbooks(paths, progress=None, workers=None):
+    # Einlesen aller Blätter aller Dateien, parallel in einem Prozesspool; die Blätter werden in der Reihenfolge
+    # der Dateien und Blätter zusammengefügt, bei mehr als einem Blatt mit der Herkunft in SOURCE_COLUMN;
+    # Rückgabe im kompakten Schema mit Speicherbericht in df.attrs['memory']
+    sheets = [(path, sheet_name) for path in paths for sheet_name in list_sheets(path)]
+    if progress is not None:
+        progress(0.0, f"Excel-Daten werden gelesen ({len(paths)} Dateien, {len(sheets)} Blätter) ...")
+    frames = {}
+    workers = _worker_count(len(sheets), workers)
+    if workers == 1:
+        for position, (path, sheet_name) in enumerate(sheets):
+            frames[position] = read_sheet(path, sheet_name)
+            _report_sheet(progress, len(frames), sheets, position)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(read_sheet, path, sheet_name): position
+                       for position, (path, sheet_name) in enumerate(sheets)}
+            for future in as_completed(futures):
+                frames[futures[future]] = future.result()
+                _report_sheet(progress, len(frames), sheets, futures[future])
+
+    parts = [(sheets[position], frames[position]) for position in sorted(frames) if frames[position] is not None]
+    if not parts:
+        raise ValueError("Die Excel-Dateien enthalten keine Daten.")
+    columns = list(parts[0][1].columns)
+    for (path, sheet_name), frame in parts:
+        if list(frame.columns) != columns:
+            raise ValueError(f"Blatt {source_label(path, sheet_name)} hat abweichende Spalten: "
+                             f"{', '.join(map(str, frame.columns))}")
+    df = pd.concat([frame for _, frame in parts], ignore_index=True) if len(parts) > 1 else parts[0][1]
+    if len(sheets) > 1:
+        labels = [source_label(path, sheet_name) for (path, sheet_name), _ in parts]
+        codes = np.repeat(np.arange(len(parts)), [len(frame) for _, frame in parts])
+        df[SOURCE_COLUMN] = data_cleaning_memory.sorted_categorical(codes, labels)
+    return data_cleaning_memory.compact_frame(df)
+
+
+def _worker_count(sheet_count, workers=None):
+    # Anzahl Prozesse; innerhalb eines Prozesspools (z. B. Stapelverarbeitung) wird nicht erneut parallelisiert
+    if multiprocessing.parent_process() is not None:
+        return 1
+    return max(1, min(workers or EXCEL_WORKERS, sheet_count))
+
+
+def _report_sheet(progress, done, sheets, position):
+    # Fortschritt nach jedem gelesenen Blatt (Meldungen nur im aufrufenden Prozess)
+    if progress is not None:
+        progress(done / len(sheets), f"{done} von {len(sheets)} Blättern gelesen ({source_label(*sheets[position])})")
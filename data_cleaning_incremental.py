@@ -0,0 +1,265 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Inkrementelle Verarbeitung fortlaufend      #
+# ergänzter CSV-Exporte, nur neue Zeilen werden bereinigt   #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+import numpy as np
+import pandas as pd
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
+from data_cleaning_tool import DataCleaningApp, CHUNK_SIZE, DEFAULT_REPORT, report_progress, scale_progress
+import data_cleaning_aggregation
+import data_cleaning_cache
+import data_cleaning_dedup
+import data_cleaning_rules
+
+# Erhöhen, sobald sich Bereinigung oder Zustandsformat ändern, damit alte Zustände neu aufgebaut werden
+STATE_VERSION = 3
+STATE_SUBDIR = "incremental"
+FINGERPRINT_SIZE = 64 * 1024  # Prüfsumme über Anfang und Ende des bereits verarbeiteten Teils
+
+# Datenblatt in der von export_report geschriebenen Arbeitsmappe (zweites Blatt)
+DATA_SHEET_PATH = 'xl/worksheets/sheet2.xml'
+
+
+def state_dir_for(input_path, cache_dir=None):
+    # Zustandsverzeichnis je Quelldatei (Hash über den absoluten Pfad) unterhalb des Cache-Verzeichnisses
+    key = hashlib.sha256(os.path.abspath(input_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir or data_cleaning_cache.DEFAULT_CACHE_DIR, STATE_SUBDIR, key)
+
+
+def update_report(input_path, report_path, cache_dir=None, report=DEFAULT_REPORT, chunk_size=CHUNK_SIZE,
+                  progress=None):
+    # Bereinigung nur der seit dem letzten Lauf angehängten Zeilen und Aktualisierung des Reports:
+    # Duplikatschlüssel, letztes gültiges Datum, Würfel und geschriebene Datenzeilen bleiben gespeichert
+    start = time.perf_counter()
+    directory = state_dir_for(input_path, cache_dir)
+    rules = data_cleaning_rules.load_rules()
+    state = _load_state(directory, input_path, rules)
+    incremental = state is not None
+    if not incremental:
+        # Vollständiger Neuaufbau, Reste eines früheren Zustands werden entfernt
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        state = _initial_state(input_path, rules)
+
+    key_index = data_cleaning_dedup.KeyIndex.load(_generation_path(directory, 'keys', state)) if incremental \
+        else data_cleaning_dedup.KeyIndex()
+    cube = data_cleaning_cache.read_frame(_generation_path(directory, 'cube', state)) if incremental else None
+    seen = data_cleaning_dedup.KeyIndex()
+    duplicates = None
+    rows_in = rows_out = 0
+    source_size = max(os.path.getsize(input_path), 1)
+
+    # Neue Zeilen an die gespeicherten Datenzeilen anhängen; Reste eines abgebrochenen Laufs werden verworfen
+    with open(os.path.join(directory, 'rows.xml'), 'ab') as rows_file, open(input_path, 'rb') as source:
+        rows_file.truncate(state['rows_bytes'])
+        for chunk in _read_appended_rows(source, state, chunk_size, rules.text_columns):
+            keys = data_cleaning_dedup.duplicate_keys(chunk, rules)
+            is_new, chunk_duplicates = data_cleaning_dedup.select_new(keys, key_index, seen)
+            duplicates = data_cleaning_dedup.merge_reports(duplicates, chunk_duplicates)
+
+            cleaned = DataCleaningApp._clean_rows(chunk[is_new].copy(), state['last_values'], rules=rules)
+            state['last_values'] = DataCleaningApp._last_values(cleaned, rules, state['last_values'])
+            cube = data_cleaning_aggregation.merge_cubes(cube, data_cleaning_aggregation.build_cube(cleaned))
+
+            rows_file.write(_rows_xml(cleaned, state['rows_total'] + 2))
+            widths = DataCleaningApp._column_widths(cleaned)
+            state['widths'] = [max(pair) for pair in zip(state['widths'], widths)] if state['widths'] else widths
+            state['columns'] = [str(column) for column in cleaned.columns]
+            state['rows_total'] += len(cleaned)
+            rows_in += len(chunk)
+            rows_out += len(cleaned)
+            report_progress(progress, 0.6 * min(source.tell() / source_size, 1.0),
+                            f"{rows_in:,} neue Zeilen gelesen, {rows_out:,} übernommen")
+        state['rows_bytes'] = rows_file.tell()
+        state['offset'] = source.tell()
+    timings = {'bereinigen': time.perf_counter() - start}
+
+    if state['columns'] is None:
+        raise ValueError("Die Datei enthält keine Datenzeilen.")
+
+    step_start = time.perf_counter()
+    # Neu erzeugt wird der Report bei neuen Zeilen, fehlender Datei oder einem anderen Reporting als zuletzt
+    if rows_in or state.get('report') != report or not os.path.exists(report_path):
+        _write_report(directory, state, cube, report_path, report, scale_progress(progress, 0.6, 1.0))
+        state['report'] = report
+    timings['report'] = time.perf_counter() - step_start
+
+    _save_state(directory, state, key_index, cube)
+    return {
+        'rows_in': rows_in,
+        'rows_out': rows_out,
+        'rows_total': state['rows_total'],
+        'duplicates': duplicates,
+        'incremental': incremental,
+        'timings': timings,
+    }
+
+
+def _initial_state(input_path, rules):
+    # Zustand vor der ersten Verarbeitung einer Quelldatei
+    return {
+        'version': STATE_VERSION,
+        'source': os.path.abspath(input_path),
+        'rules': rules.digest,
+        'dedup': data_cleaning_dedup.settings_digest(),
+        'generation': 0,
+        'offset': 0,
+        'fingerprint': None,
+        'source_columns': None,
+        'columns': None,
+        'widths': None,
+        'last_values': {},
+        'rows_total': 0,
+        'rows_bytes': 0,
+        'report': None,
+    }
+
+
+def _load_state(directory, input_path, rules):
+    # Laden des gespeicherten Zustands, None falls keiner vorhanden ist, die Datei nicht nur ergänzt,
+    # sondern verändert wurde oder sich Bereinigungsregeln bzw. Schlüsselbildung der Duplikaterkennung geändert
+    # haben (dann vollständiger Neuaufbau, gespeicherte Schlüssel wären nicht mehr vergleichbar)
+    try:
+        with open(os.path.join(directory, 'state.json'), encoding='utf-8') as state_file:
+            state = json.load(state_file)
+    except (OSError, ValueError):
+        return None
+    if state.get('version') != STATE_VERSION or state['source'] != os.path.abspath(input_path):
+        return None
+    if state['rules'] != rules.digest or state.get('dedup') != data_cleaning_dedup.settings_digest():
+        return None
+    if os.path.getsize(input_path) < state['offset']:
+        return None
+    if _fingerprint(input_path, state['offset']) != state['fingerprint']:
+        return None
+    return state
+
+
+def _save_state(directory, state, key_index, cube):
+    # Speichern von Schlüsseln und Würfel unter einer neuen Generation, danach atomares Ersetzen
+    # des Zustands; bis dahin bleibt der vorherige Stand vollständig gültig
+    previous = dict(state)
+    state['generation'] += 1
+    state['fingerprint'] = _fingerprint(state['source'], state['offset'])
+
+    key_index.save(_generation_path(directory, 'keys', state))
+    data_cleaning_cache.write_frame(cube, _generation_path(directory, 'cube', state))
+
+    temp_path = os.path.join(directory, f"state.json.{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as state_file:
+        json.dump(state, state_file)
+    os.replace(temp_path, os.path.join(directory, 'state.json'))
+
+    for name in ('keys', 'cube'):
+        old_path = _generation_path(directory, name, previous)
+        if previous['generation'] and os.path.exists(old_path):
+            os.remove(old_path)
+
+
+def _generation_path(directory, name, state):
+    # Pfad von Schlüsseln bzw. Würfel einer Zustandsgeneration
+    extension = 'npy' if name == 'keys' else 'npz'
+    return os.path.join(directory, f"{name}-{state['generation']}.{extension}")
+
+
+def _fingerprint(input_path, offset):
+    # Prüfsumme über Anfang und Ende des verarbeiteten Teils; geänderte ältere Zeilen
+    # (statt nur angehängter) werden so ohne erneutes Lesen der ganzen Datei erkannt
+    digest = hashlib.sha256(str(offset).encode('ascii'))
+    with open(input_path, 'rb') as source:
+        digest.update(source.read(min(offset, FINGERPRINT_SIZE)))
+        source.seek(max(0, offset - FINGERPRINT_SIZE))
+        digest.update(source.read(min(offset, FINGERPRINT_SIZE)))
+    return digest.hexdigest()
+
+
+def _read_appended_rows(source, state, chunk_size, text_columns):
+    # Blockweises Lesen ab dem zuletzt verarbeiteten Byte; die Spaltennamen stammen
+    # beim Fortsetzen aus dem Zustand, da die Kopfzeile nicht erneut gelesen wird
+    source.seek(state['offset'])
+    text_columns = dict.fromkeys(text_columns, object)
+    if state['offset'] == 0:
+        reader = pd.read_csv(source, chunksize=chunk_size, dtype=text_columns)
+    else:
+        reader = pd.read_csv(source, chunksize=chunk_size, dtype=text_columns, header=None,
+                             names=state['source_columns'])
+    for chunk in reader:
+        if state['source_columns'] is None:
+            state['source_columns'] = [str(column) for column in chunk.columns]
+        yield chunk
+
+
+def _rows_xml(df, first_row):
+    # Datenzeilen als SpreadsheetML wie beim write-only Export von openpyxl
+    # (Zahlen als Werte, Texte als Inline-Strings, fehlende Werte ohne Zelle), spaltenweise erzeugt
+    numbers = pd.Series(np.arange(first_row, first_row + len(df)).astype(str), dtype=object)
+    rows = '<row r="' + numbers + '">'
+    for position, column in enumerate(df.columns, start=1):
+        rows += _cells_xml(df[column], get_column_letter(position), numbers)
+    return ''.join(rows + '</row>').encode('utf-8')
+
+
+def _cells_xml(series, column_letter, numbers):
+    # Zellen einer Spalte als SpreadsheetML-Texte, eine Zeichenkette je Zeile
+    values = pd.Series(DataCleaningApp._excel_values(series), dtype=object)
+    is_text = values.map(type).eq(str)
+    is_number = ~is_text & values.notna()
+    cells = pd.Series('', index=values.index, dtype=object)
+
+    texts = values[is_text].str.replace(ILLEGAL_CHARACTERS_RE, '', regex=True)
+    escaped = texts.str.replace('&', '&amp;').str.replace('<', '&lt;').str.replace('>', '&gt;')
+    space = pd.Series(' xml:space="preserve"', index=texts.index).where(texts.str.strip() != texts, '')
+    cells[is_text] = (f'<c r="{column_letter}' + numbers[is_text] + '" t="inlineStr"><is><t' + space + '>'
+                      + escaped + '</t></is></c>')
+    cells[is_number] = (f'<c r="{column_letter}' + numbers[is_number] + '" t="n"><v>'
+                        + values[is_number].map('{:.16g}'.format) + '</v></c>')
+    return cells
+
+
+def _write_report(directory, state, cube, report_path, report, progress=None):
+    # Report aus Diagrammen des Würfels und den gespeicherten Datenzeilen; openpyxl schreibt nur
+    # Diagrammblatt und Überschrift, die Zeilen werden unverändert in das Datenblatt kopiert
+    with tempfile.TemporaryDirectory() as temp_dir:
+        images = DataCleaningApp.render_charts(cube, report, scale_progress(progress, 0.0, 0.5))
+        skeleton_path = os.path.join(temp_dir, 'report.xlsx')
+        DataCleaningApp.export_report(pd.DataFrame(columns=state['columns']), skeleton_path, images,
+                                      column_widths=state['widths'])
+        _splice_rows(skeleton_path, os.path.join(directory, 'rows.xml'), report_path)
+    report_progress(progress, 1.0, f"{state['rows_total']:,} Zeilen gespeichert")
+
+
+def _splice_rows(skeleton_path, rows_path, report_path):
+    # Einfügen der gespeicherten Zeilen hinter der Überschrift des Datenblatts, alle übrigen
+    # Teile der Arbeitsmappe werden übernommen; atomares Ersetzen des bisherigen Reports
+    temp_path = f"{report_path}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(skeleton_path) as skeleton, \
+            zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as target:
+        for item in skeleton.infolist():
+            content = skeleton.read(item.filename)
+            if item.filename != DATA_SHEET_PATH:
+                target.writestr(item, content)
+                continue
+            head, tail = content.split(b'</sheetData>')
+            with target.open(item.filename, 'w', force_zip64=True) as entry, open(rows_path, 'rb') as rows:
+                entry.write(head)
+                shutil.copyfileobj(rows, entry, data_cleaning_cache.HASH_BLOCK_SIZE)
+                entry.write(b'</sheetData>' + tail)
+    os.replace(temp_path, report_path)
@@ -0,0 +1,168 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Speichersparendes Schema der geladenen      #
+# Daten und Speicherbericht je Zeile                        #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import sys
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Textspalten mit höchstens so vielen unterschiedlichen Werten je Zeile werden als Kategorien gespeichert
+CATEGORY_MAX_RATIO = 0.5
+
+# Mögliche kleinere Ganzzahltypen, aufsteigend
+INTEGER_TYPES = [np.dtype(np.int8), np.dtype(np.int16), np.dtype(np.int32)]
+
+# Größe eines Zeigers bzw. fehlenden Werts in einer Textspalte (object), wie bei memory_usage(deep=True)
+POINTER_BYTES = np.dtype(object).itemsize
+MISSING_BYTES = sys.getsizeof(float('nan'))
+
+
+def compact_frame(df):
+    # Kompaktes Schema für geladene Daten, die Spalten werden im DataFrame ersetzt (keine Kopie der übrigen):
+    # Texte als Kategorien mit sortierten Werten, Ganzzahlen im kleinsten passenden Typ, Kommazahlen als
+    # float32, sofern dabei kein Wert verändert wird; der Speicherbericht steht in df.attrs['memory']
+    before = after = df.index.memory_usage()
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            before += _object_bytes(series.cat.codes.to_numpy(), series.cat.categories)
+            compact = sort_categories(series)
+        elif series.dtype == object:
+            codes, uniques = pd.factorize(series)
+            before += _object_bytes(codes, uniques)
+            compact = _compact_text(series, codes, uniques)
+        else:
+            before += series.memory_usage(index=False)
+            compact = compact_series(series)
+        if compact is not series:
+            df[column] = compact
+        after += compact.memory_usage(index=False, deep=True)
+    df.attrs['memory'] = {'rows': len(df), 'before': int(before), 'after': int(after)}
+    return df
+
+
+def compact_series(series):
+    # Kompakte Darstellung einer Spalte, unverändert zurück falls keine kleinere möglich ist
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return sort_categories(series)
+    if series.dtype == object:
+        return _compact_text(series, *pd.factorize(series))
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return _downcast_integers(series)
+    if pd.api.types.is_float_dtype(series.dtype) and series.dtype.itemsize > 4:
+        narrow = series.astype(np.float32)
+        if np.array_equal(narrow.to_numpy(np.float64), series.to_numpy(), equal_nan=True):
+            return narrow
+    return series
+
+
+def _compact_text(series, codes, uniques):
+    # Textspalte als Kategorien, sofern sich die Werte ausreichend wiederholen und alle Texte sind; leere bzw.
+    # vollständig fehlende Spalten bleiben unverändert (ohne Werte ist nicht erkennbar, ob es Texte oder Zahlen sind)
+    if not len(uniques) or len(uniques) > CATEGORY_MAX_RATIO * len(series) \
+            or not all(isinstance(value, str) for value in uniques):
+        return series
+    return pd.Series(sorted_categorical(codes, uniques), index=series.index, name=series.name)
+
+
+def _downcast_integers(series):
+    # Kleinster vorzeichenbehafteter Ganzzahltyp, der alle Werte aufnimmt (Minimum und Maximum genügen)
+    if series.empty:
+        return series
+    low, high = series.min(), series.max()
+    for dtype in INTEGER_TYPES:
+        if dtype.itemsize < series.dtype.itemsize and np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return series.astype(dtype)
+    return series
+
+
+def sort_categories(series):
+    # Kategorien in sortierter Reihenfolge (wie bei Texten), damit Gruppierungen unverändert sortiert sind
+    categories = series.cat.categories
+    if categories.is_monotonic_increasing:
+        return series
+    return series.cat.reorder_categories(categories.sort_values())
+
+
+def sorted_categorical(codes, uniques):
+    # Kategorische Werte aus factorize-Codes (-1 für fehlende Werte), Kategorien sortiert
+    order = np.argsort(np.asarray(uniques, dtype=object))
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    sorted_codes = np.where(codes >= 0, ranks[np.maximum(codes, 0)], -1) if len(order) else codes
+    return pd.Categorical.from_codes(sorted_codes, categories=pd.Index(uniques, dtype=object)[order])
+
+
+def title_case(values):
+    # Einheitliche Schreibweise, jeder unterschiedliche Wert wird nur einmal umgewandelt;
+    # Kategorien bleiben Kategorien (gleich geschriebene Werte werden zusammengefasst)
+    codes, uniques = pd.factorize(values)
+    titled = pd.Series(uniques, dtype=object).str.title().to_numpy()
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        titled_codes, titled_uniques = pd.factorize(titled)
+        codes = np.append(titled_codes, -1)[codes]
+        return pd.Series(sorted_categorical(codes, titled_uniques), index=values.index)
+    result = values.to_numpy(dtype=object, copy=True)
+    valid = codes >= 0
+    result[valid] = titled[codes[valid]]
+    return pd.Series(result, index=values.index, dtype=object)
+
+
+def widen(series):
+    # Zahlen im vollen Wertebereich (int64/float64) für Berechnungen und Summen, damit verkleinerte
+    # Typen nicht überlaufen; bereits breite Spalten werden ohne Kopie zurückgegeben
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    if pd.api.types.is_integer_dtype(series.dtype) and series.dtype.itemsize < 8:
+        return series.astype(np.int64)
+    if pd.api.types.is_float_dtype(series.dtype) and series.dtype.itemsize < 8:
+        return series.astype(np.float64)
+    return series
+
+
+def concat_frames(frames):
+    # Zusammenfügen blockweise gelesener Daten; Kategorien werden vereinigt statt in Texte zurückverwandelt
+    if len(frames) == 1:
+        return frames[0]
+    columns = {}
+    for column in frames[0].columns:
+        parts = [frame[column] for frame in frames]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            columns[column] = union_categoricals([part.array for part in parts], sort_categories=True)
+        else:
+            columns[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns, columns=frames[0].columns)
+
+
+def _object_bytes(codes, uniques):
+    # Speicherbedarf einer Textspalte als object (Zeiger plus Python-Objekt je Zeile, wie memory_usage(deep=True)),
+    # auch für bereits kategorisch gelesene Spalten; berechnet je unterschiedlichem Wert statt je Zeile
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    sizes = np.fromiter((sys.getsizeof(value) for value in uniques), dtype=np.int64, count=len(uniques))
+    return POINTER_BYTES * len(codes) + int(counts @ sizes) + MISSING_BYTES * int((codes < 0).sum())
+
+
+def frame_bytes(df):
+    # Tatsächlicher Speicherbedarf eines DataFrames einschließlich Index
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def describe_memory(memory):
+    # Einzeilige Beschreibung des Speicherberichts (Bytes je Zeile vor und nach dem kompakten Schema)
+    rows = max(memory['rows'], 1)
+    saving = 1 - memory['after'] / memory['before'] if memory['before'] else 0.0
+    return (f"Speicher {memory['before'] / rows:,.0f} -> {memory['after'] / rows:,.0f} Bytes je Zeile "
+            f"({saving:.0%} gespart)")
@@ -0,0 +1,176 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Bereinigungsregeln und Zuordnungstabellen   #
+# aus einer Konfigurationsdatei, vorkompiliert              #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import copy
+import csv
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+# Konfigurationsdatei: Umgebungsvariable (z. B. von der Stapelverarbeitung gesetzt), sonst Benutzerverzeichnis
+RULES_ENV_VAR = "DATA_CLEANING_RULES"
+USER_RULES_PATH = os.path.join(os.path.expanduser("~"), ".data_cleaning_tool", "rules.json")
+
+# Standardregeln, gelten für alle in der Konfigurationsdatei nicht angegebenen Einträge
+DEFAULT_CONFIG = {
+    # Spalten für die Erkennung doppelter Einträge (ohne Kommentar)
+    'duplicate_columns': ['Datum', 'Verkäufer', 'Region', 'Produkt', 'Verkaufte Menge', 'Umsatz pro Einheit',
+                          'Gesamtumsatz'],
+    # Textspalten der Quelldateien, beim blockweisen Einlesen immer als Text typisiert
+    'text_columns': ['Datum', 'Verkäufer', 'Region', 'Produkt', 'Kommentar'],
+    # Häufige Datumsformate der Quelldateien, die gesammelt geparst werden
+    'date_formats': ['%Y-%m-%d', '%m/%d/%Y', '%m-%d-%Y'],
+    # Verkäufer mit Region (Objekt oder Pfad zu einer CSV-Datei mit den Spalten Verkäufer, Region)
+    'sellers': {'Peter Schmidt': 'AMERICAS', 'Stefan Berger': 'EMEA', 'Dirk Donner': 'ASIA'},
+    # Weitere Zuordnungstabellen für fill_from_lookup (Objekt oder Pfad zu einer CSV-Datei mit zwei Spalten)
+    'tables': {},
+    # Bereinigungsschritte in Ausführungsreihenfolge
+    'rules': [
+        {'rule': 'parse_dates', 'column': 'Datum'},
+        {'rule': 'fill_forward', 'column': 'Datum'},
+        {'rule': 'fill_from_lookup', 'target': 'Verkäufer', 'source': 'Region', 'table': 'region_sellers'},
+        {'rule': 'title_case', 'column': 'Verkäufer'},
+        {'rule': 'fill_from_lookup', 'target': 'Region', 'source': 'Verkäufer', 'table': 'seller_regions'},
+        {'rule': 'month', 'column': 'Monat', 'source': 'Datum'},
+        {'rule': 'multiply', 'column': 'Gesamtumsatz', 'factors': ['Verkaufte Menge', 'Umsatz pro Einheit']},
+    ],
+}
+
+# Bekannte Regeln mit Pflichtangaben und Beschreibung für die Fortschrittsanzeige
+RULE_TYPES = {
+    'parse_dates': (['column'], "Datumsangaben vereinheitlicht"),
+    'fill_forward': (['column'], "Fehlende Werte mit dem Vorgänger aufgefüllt"),
+    'fill_from_lookup': (['target', 'source', 'table'], "Fehlende Werte aus Zuordnungstabelle ergänzt"),
+    'title_case': (['column'], "Schreibweise vereinheitlicht"),
+    'month': (['column', 'source'], "Monat berechnet"),
+    'multiply': (['column', 'factors'], "Produkt berechnet"),
+}
+
+_loaded_rules = {}
+_loaded_rules_lock = threading.Lock()
+
+
+class Lookup:
+    # Vorkompilierte Zuordnungstabelle: Hash-Index über die Schlüssel, einmal aufgebaut; beim Anwenden
+    # wird jeder unterschiedliche Wert einmal nachgeschlagen, die Zeilen über ihre Codes zugeordnet
+    def __init__(self, mapping):
+        self.index = pd.Index(list(mapping), dtype=object)
+        self.values = np.array([*mapping.values(), None], dtype=object)  # letzter Eintrag für "nicht gefunden"
+
+    def __len__(self):
+        return len(self.index)
+
+    def map(self, series):
+        # Zugeordnete Werte je Zeile, None für fehlende oder unbekannte Schlüssel
+        codes, uniques = pd.factorize(series)
+        mapped = np.append(self.values[self.index.get_indexer(uniques)], None)
+        return pd.Series(mapped[codes], index=series.index, dtype=object)
+
+
+class CleaningRules:
+    # Geladene und vorkompilierte Konfiguration der Bereinigung
+    def __init__(self, config, base_dir=None):
+        self.config = _resolve_tables(config, base_dir)
+        self.duplicate_columns = list(self.config['duplicate_columns'])
+        self.text_columns = list(self.config['text_columns'])
+        self.date_formats = list(self.config['date_formats'])
+        self.rules = [_validate_rule(rule) for rule in self.config['rules']]
+        self.lookups = {name: Lookup(table) for name, table in self._tables().items()}
+        for rule in self.rules:
+            if rule['rule'] == 'fill_from_lookup' and rule['table'] not in self.lookups:
+                raise ValueError(f"Unbekannte Zuordnungstabelle in Regel {rule}: {rule['table']}")
+
+        # Prüfsumme über die vollständige Konfiguration (inkl. Tabellen aus CSV-Dateien) für Cache-Schlüssel
+        canonical = json.dumps(self.config, sort_keys=True, ensure_ascii=False)
+        self.digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _tables(self):
+        # Zuordnungstabellen; aus der Verkäuferliste abgeleitet: Verkäufer -> Region sowie
+        # Region -> Verkäufer für Regionen mit genau einem Verkäufer (sonst ist die Zuordnung nicht eindeutig)
+        sellers = self.config['sellers']
+        seller_counts = pd.Series(list(sellers.values()), dtype=object).value_counts()
+        tables = {
+            'seller_regions': dict(sellers),
+            'region_sellers': {region: seller for seller, region in sellers.items() if seller_counts[region] == 1},
+        }
+        tables.update(self.config['tables'])
+        return tables
+
+
+def rules_path():
+    # Pfad der aktiven Konfigurationsdatei, None für die Standardregeln
+    path = os.environ.get(RULES_ENV_VAR)
+    if path:
+        return path
+    return USER_RULES_PATH if os.path.exists(USER_RULES_PATH) else None
+
+
+def load_rules(path=None):
+    # Laden und Kompilieren der Regeln, je Datei und Änderungszeitpunkt nur einmal
+    path = path or rules_path()
+    key = (path, os.path.getmtime(path) if path else None)
+    with _loaded_rules_lock:
+        if key not in _loaded_rules:
+            _loaded_rules[key] = _read_rules(path)
+        return _loaded_rules[key]
+
+
+def _read_rules(path):
+    # Einlesen einer Konfigurationsdatei, fehlende Einträge aus den Standardregeln
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if path is None:
+        return CleaningRules(config)
+    with open(path, encoding='utf-8') as source:
+        overrides = json.load(source)
+    unknown = set(overrides) - set(DEFAULT_CONFIG)
+    if unknown:
+        raise ValueError(f"Unbekannte Einträge in {path}: {', '.join(sorted(unknown))}")
+    config.update(overrides)
+    return CleaningRules(config, os.path.dirname(os.path.abspath(path)))
+
+
+def _resolve_tables(config, base_dir):
+    # Ersetzen von Tabellenpfaden durch den Inhalt der CSV-Dateien (relativ zur Konfigurationsdatei)
+    config = dict(config)
+    config['sellers'] = _read_table(config['sellers'], base_dir)
+    config['tables'] = {name: _read_table(table, base_dir) for name, table in config['tables'].items()}
+    return config
+
+
+def _read_table(table, base_dir):
+    # Zuordnungstabelle als Objekt oder CSV-Datei mit Kopfzeile (erste Spalte Schlüssel, zweite Spalte Wert)
+    if isinstance(table, dict):
+        return table
+    path = table if os.path.isabs(table) or base_dir is None else os.path.join(base_dir, table)
+    with open(path, newline='', encoding='utf-8-sig') as source:
+        rows = list(csv.reader(source))[1:]
+    return {row[0]: row[1] for row in rows if len(row) >= 2 and row[0]}
+
+
+def _validate_rule(rule):
+    # Prüfung einer Regel auf bekannten Typ und Pflichtangaben
+    if rule.get('rule') not in RULE_TYPES:
+        raise ValueError(f"Unbekannte Regel: {rule}")
+    missing = [field for field in RULE_TYPES[rule['rule']][0] if field not in rule]
+    if missing:
+        raise ValueError(f"Fehlende Angaben {', '.join(missing)} in Regel {rule}")
+    return rule
+
+
+def describe(rule):
+    # Beschreibung einer Regel für die Fortschrittsanzeige
+    return f"{RULE_TYPES[rule['rule']][1]} ({rule['column'] if 'column' in rule else rule['target']})"
@@ -0,0 +1,338 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Lokaler HTTP-Dienst, der hochgeladene       #
+# Dateien im Hintergrund zu Excel-Reports verarbeitet       #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+# Diagramme ohne Bildschirm rendern (wie in der Stapelverarbeitung)
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from data_cleaning_tool import DEFAULT_REPORT, REPORTS  # noqa: E402
+import data_cleaning_cli  # noqa: E402
+import data_cleaning_dedup  # noqa: E402
+import data_cleaning_rules  # noqa: E402
+
+DEFAULT_HOST = "127.0.0.1"  # Nur lokal erreichbar; für das Team z. B. --host 0.0.0.0
+DEFAULT_PORT = 8765
+DEFAULT_SERVER_DIR = os.path.join(os.path.expanduser("~"), ".data_cleaning_tool", "server")
+
+# Gleichzeitig erzeugte Reports; Threads, damit alle Aufträge den Diagrammzwischenspeicher teilen
+SERVER_WORKERS = os.cpu_count() or 1
+MAX_UPLOAD_BYTES = 512 * 1024 * 1024
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+MAX_WAIT_SECONDS = 60  # Höchste Wartezeit einer Statusabfrage mit ?wait=
+SOCKET_TIMEOUT_SECONDS = 120  # Abbruch von Verbindungen, die nichts mehr senden oder empfangen
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+JOB_ID_PATTERN = re.compile(r"[0-9a-f]{24}")
+
+
+class ReportJob:
+    # Auftrag zur Erzeugung eines Reports aus einer hochgeladenen Datei, Zustand queued, running, done oder error;
+    # Verzeichnis mit Quelldatei, Report und Auftragsdaten (job.json, nach Abschluss result.json)
+    def __init__(self, job_id, name, report, directory):
+        self.id = job_id
+        self.name = name
+        self.report = report
+        self.directory = directory
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.finished = threading.Event()
+
+    @property
+    def input_path(self):
+        return os.path.join(self.directory, f"input{os.path.splitext(self.name)[1].lower()}")
+
+    @property
+    def output_path(self):
+        return data_cleaning_cli.output_path_for(self.input_path, self.directory)
+
+    @property
+    def download_name(self):
+        return f"{os.path.splitext(self.name)[0]}{data_cleaning_cli.OUTPUT_SUFFIX}.xlsx"
+
+    def finish(self, result=None, error=None):
+        # Abschluss des Auftrags; das Ergebnis wird gespeichert und nach einem Neustart wiederverwendet
+        if error is None:
+            # Atomares Ersetzen, ein Schreibfehler hinterlässt kein halbes result.json
+            result_path = os.path.join(self.directory, 'result.json')
+            with open(f"{result_path}.tmp", 'w', encoding='utf-8') as target:
+                json.dump(result, target)
+            os.replace(f"{result_path}.tmp", result_path)
+        self.result, self.error = result, error
+        self.status = 'done' if error is None else 'error'
+        self.finished.set()
+
+    def to_json(self):
+        # Zustand für die Antwort des Dienstes
+        state = {'id': self.id, 'name': self.name, 'report': self.report, 'status': self.status,
+                 'url': f"/reports/{self.id}"}
+        if self.status == 'done':
+            state['download'] = f"/reports/{self.id}/download"
+            state['result'] = self.result
+        if self.error:
+            state['error'] = self.error
+        return state
+
+    @classmethod
+    def load(cls, directory):
+        # Abgeschlossener Auftrag eines früheren Laufs, None falls nicht vorhanden oder nicht abgeschlossen
+        try:
+            with open(os.path.join(directory, 'job.json'), encoding='utf-8') as source:
+                meta = json.load(source)
+            with open(os.path.join(directory, 'result.json'), encoding='utf-8') as source:
+                result = json.load(source)
+        except (OSError, ValueError):
+            return None
+        job = cls(os.path.basename(directory), meta['name'], meta['report'], directory)
+        job.status, job.result = 'done', result
+        job.finished.set()
+        return job
+
+
+class ReportService:
+    # Annahme hochgeladener Dateien und Erzeugung der Reports im Hintergrund: gleiche Eingaben (Dateiinhalt,
+    # Reporting, Bereinigungsregeln) ergeben denselben Auftrag, bereinigte Daten und Würfel kommen aus dem
+    # gemeinsamen Cache, unveränderte Diagramme aus dem Diagrammzwischenspeicher
+    def __init__(self, directory=None, cache_dir=None, workers=SERVER_WORKERS):
+        self.directory = directory or DEFAULT_SERVER_DIR
+        self.cache_dir = cache_dir
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._source_locks = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report")
+        os.makedirs(self.directory, exist_ok=True)
+
+    def submit(self, source, name, report=DEFAULT_REPORT, size=None):
+        # Annahme einer Datei (size Bytes aus source), Rückgabe des neuen oder bereits vorhandenen Auftrags
+        if not name.lower().endswith(data_cleaning_cli.SUPPORTED_EXTENSIONS):
+            raise ValueError(f"Nicht unterstützter Dateityp: {name!r} (erlaubt: "
+                             f"{', '.join(data_cleaning_cli.SUPPORTED_EXTENSIONS)})")
+        if report not in REPORTS:
+            raise ValueError(f"Unbekanntes Reporting: {report!r}")
+        upload_path, file_digest = self._receive(source, size)
+        rules_digest = data_cleaning_rules.load_rules().digest
+        dedup_digest = data_cleaning_dedup.settings_digest()
+        job_id = hashlib.sha256(f"{file_digest}|{report}|{rules_digest}|{dedup_digest}".encode()).hexdigest()[:24]
+
+        with self._lock:
+            job = self.jobs.get(job_id) or ReportJob.load(os.path.join(self.directory, job_id))
+            if job is not None and job.status != 'error':
+                os.remove(upload_path)
+                self.jobs[job_id] = job
+                return job
+            job = ReportJob(job_id, os.path.basename(name), report, os.path.join(self.directory, job_id))
+            os.makedirs(job.directory, exist_ok=True)
+            os.replace(upload_path, job.input_path)
+            with open(os.path.join(job.directory, 'job.json'), 'w', encoding='utf-8') as target:
+                json.dump({'name': job.name, 'report': job.report}, target)
+            self.jobs[job_id] = job
+            source_lock = self._source_locks.setdefault(file_digest, threading.Lock())
+        self._executor.submit(self._run, job, source_lock)
+        return job
+
+    def get(self, job_id):
+        # Auftrag nach Kennung, auch abgeschlossene Aufträge früherer Läufe; None falls unbekannt
+        if not JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                job = ReportJob.load(os.path.join(self.directory, job_id))
+                if job is not None:
+                    self.jobs[job_id] = job
+            return job
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def _receive(self, source, size):
+        # Hochgeladene Datei blockweise in eine temporäre Datei schreiben, Rückgabe von Pfad und SHA-256
+        digest = hashlib.sha256()
+        remaining = size
+        handle, upload_path = tempfile.mkstemp(suffix=".upload", dir=self.directory)
+        try:
+            with os.fdopen(handle, 'wb') as target:
+                while remaining is None or remaining > 0:
+                    block = source.read(UPLOAD_BLOCK_SIZE if remaining is None else min(remaining, UPLOAD_BLOCK_SIZE))
+                    if not block:
+                        break
+                    digest.update(block)
+                    target.write(block)
+                    if remaining is not None:
+                        remaining -= len(block)
+            if remaining:
+                raise ValueError("Die Datei wurde nicht vollständig übertragen.")
+        except BaseException:
+            os.remove(upload_path)
+            raise
+        return upload_path, digest.hexdigest()
+
+    def _run(self, job, source_lock):
+        # Erzeugung eines Reports; Aufträge mit derselben Quelldatei (andere Reportings) laufen nacheinander,
+        # damit die Daten nur einmal bereinigt und danach aus dem Cache gelesen werden. Jeder Fehler, auch beim
+        # Speichern des Ergebnisses, schließt den Auftrag mit Fehler ab (wartende Abfragen enden immer)
+        with source_lock:
+            job.status = 'running'
+            try:
+                result = data_cleaning_cli.process_file(job.input_path, job.directory, cache_dir=self.cache_dir,
+                                                        report=job.report)
+                job.finish({name: value for name, value in result.items() if name not in ('input', 'output')})
+            except Exception as error:
+                job.finish(error=f"{type(error).__name__}: {error}")
+
+
+class ReportServer(ThreadingHTTPServer):
+    # HTTP-Server mit einem Thread je Anfrage und gemeinsamem ReportService
+    daemon_threads = True
+
+    def __init__(self, address, service, quiet=False):
+        super().__init__(address, ReportRequestHandler)
+        self.service = service
+        self.quiet = quiet
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    # POST /reports?name=datei.csv&report=...  Datei im Anfragekörper, Antwort 202 (bzw. 200 falls vorhanden)
+    # GET  /reports/<id>[?wait=Sekunden]        Zustand des Auftrags
+    # GET  /reports/<id>/download               Fertiger Excel-Report
+    server_version = "DataCleaningTool/1.0"
+    timeout = SOCKET_TIMEOUT_SECONDS
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if not parts:
+            self._send_json(HTTPStatus.OK, {'reports': list(REPORTS), 'default_report': DEFAULT_REPORT})
+            return
+        job = self.server.service.get(parts[1]) if parts[0] == 'reports' and len(parts) in (2, 3) else None
+        if job is None or (len(parts) == 3 and parts[2] != 'download'):
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': "Nicht gefunden."})
+            return
+        if len(parts) == 2:
+            wait = _float_parameter(parse_qs(url.query), 'wait')
+            if wait is not None and wait > 0:
+                job.finished.wait(min(wait, MAX_WAIT_SECONDS))
+            self._send_json(HTTPStatus.OK, job.to_json())
+        elif job.status != 'done':
+            self._send_json(HTTPStatus.CONFLICT, job.to_json())
+        else:
+            self._send_file(job.output_path, job.download_name)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/reports':
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': "Nicht gefunden."})
+            return
+        length = self.headers.get('Content-Length')
+        if length is None or not length.isdigit():
+            self._send_json(HTTPStatus.LENGTH_REQUIRED, {'error': "Content-Length fehlt."})
+            return
+        if int(length) > MAX_UPLOAD_BYTES:
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            {'error': f"Datei größer als {MAX_UPLOAD_BYTES // (1024 * 1024)} MB."})
+            return
+        query = parse_qs(url.query)
+        name = query.get('name', [''])[0]
+        report = query.get('report', [DEFAULT_REPORT])[0]
+        try:
+            job = self.server.service.submit(self.rfile, name, report, int(length))
+        except ValueError as error:
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(error)})
+            return
+        status = HTTPStatus.OK if job.status == 'done' else HTTPStatus.ACCEPTED
+        self._send_json(status, job.to_json(), {'Location': f"/reports/{job.id}"})
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_file(self, path, download_name):
+        # Report blockweise senden, Dateiname im Header nach RFC 5987 (Umlaute)
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', XLSX_CONTENT_TYPE)
+        self.send_header('Content-Length', str(os.path.getsize(path)))
+        self.send_header('Content-Disposition', f"attachment; filename*=UTF-8''{quote(download_name)}")
+        self.end_headers()
+        with open(path, 'rb') as source:
+            for block in iter(lambda: source.read(UPLOAD_BLOCK_SIZE), b''):
+                self.wfile.write(block)
+
+
+def _float_parameter(query, name):
+    # Zahl aus den Abfrageparametern, None falls nicht angegeben oder ungültig (auch nan und inf)
+    try:
+        value = float(query[name][0])
+    except (KeyError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lokaler Report-Dienst des Data Cleaning Tools")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Adresse des Dienstes")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port des Dienstes")
+    parser.add_argument("--dir", default=DEFAULT_SERVER_DIR, help="Verzeichnis für hochgeladene Dateien und Reports")
+    parser.add_argument("--cache-dir", default=None, help="Verzeichnis für zwischengespeicherte bereinigte Daten")
+    parser.add_argument("-w", "--workers", type=int, default=SERVER_WORKERS, help="Gleichzeitig erzeugte Reports")
+    parser.add_argument("--rules", default=None, help="JSON-Datei mit Bereinigungsregeln")
+    arguments = parser.parse_args(argv)
+    if arguments.rules:
+        try:
+            data_cleaning_rules.load_rules(arguments.rules)
+        except (OSError, ValueError, KeyError) as error:
+            parser.error(f"Bereinigungsregeln aus {arguments.rules} ungültig: {error}")
+        os.environ[data_cleaning_rules.RULES_ENV_VAR] = os.path.abspath(arguments.rules)
+
+    # Prozesse zum Lesen der Excel-Blätter nicht aus dem mehrfädigen Server forken
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        multiprocessing.set_start_method('forkserver', force=True)
+
+    service = ReportService(arguments.dir, arguments.cache_dir, max(1, arguments.workers))
+    server = ReportServer((arguments.host, arguments.port), service)
+    print(f"Report-Dienst läuft auf http://{arguments.host}:{server.server_port}/ (Beenden mit Strg+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
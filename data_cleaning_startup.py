@@ -0,0 +1,124 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Schneller Programmstart durch verzögertes   #
+# Laden der Bibliotheken, Vorladen und Importzeit-Bericht   #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import threading
+
+# Zielwert für den Import des Hauptmoduls, danach kann das Fenster sofort erscheinen
+STARTUP_TARGET = 0.5
+MAIN_MODULE = "data_cleaning_tool"
+
+# Arbeitsverzeichnis der Messprozesse, damit die Module auch bei Aufruf von außerhalb gefunden werden
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bibliotheken, die erst bei Bedarf bzw. im Hintergrund geladen werden
+HEAVY_MODULES = ['numpy', 'pandas', 'openpyxl', 'matplotlib', 'matplotlib.figure', 'matplotlib.backends.backend_agg']
+
+
+class LazyModule:
+    # Platzhalter für ein Modul, das erst beim ersten Attributzugriff importiert wird;
+    # gleichzeitige Zugriffe mehrerer Threads sichert die Importsperre von Python ab
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+    def __repr__(self):
+        state = "geladen" if self._module is not None else "nicht geladen"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def warm_up():
+    # Laden aller für die Verarbeitung benötigten Bibliotheken; die Importe stehen ausdrücklich
+    # im Code, damit PyInstaller auch die erst bei Bedarf geladenen Module mitpackt
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    import openpyxl  # noqa: F401
+    import matplotlib.ticker  # noqa: F401
+    import matplotlib.figure  # noqa: F401
+    import matplotlib.backends.backend_agg  # noqa: F401
+    import data_cleaning_cache  # noqa: F401
+    import data_cleaning_aggregation  # noqa: F401
+    import data_cleaning_rules  # noqa: F401
+    import data_cleaning_dates  # noqa: F401
+    import data_cleaning_memory  # noqa: F401
+    import data_cleaning_dedup  # noqa: F401
+    import data_cleaning_excel  # noqa: F401
+    import data_cleaning_telemetry  # noqa: F401
+
+
+def start_warm_up():
+    # Vorladen im Hintergrund, während das Fenster bereits angezeigt wird
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def measure_import(module, loaded=()):
+    # Importdauer eines Moduls in einem frischen Interpreter, optional mit der Liste
+    # der dabei ebenfalls geladenen Module aus loaded
+    code = ("import sys, time\n"
+            "start = time.perf_counter()\n"
+            f"import {module}\n"
+            "print(time.perf_counter() - start)\n"
+            f"print(','.join(name for name in {list(loaded)!r} if name in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=PROJECT_DIR).stdout
+    seconds, modules = output.splitlines()
+    return float(seconds), [name for name in modules.split(',') if name]
+
+
+def slowest_imports(module, count=10):
+    # Langsamste Einzelimporte laut "python -X importtime" (kumulierte Dauer in Sekunden)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True, cwd=PROJECT_DIR)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative) / 1e6, name.rstrip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importzeit-Bericht des Data Cleaning Tools")
+    parser.add_argument("--target", type=float, default=STARTUP_TARGET,
+                        help="Zielwert in Sekunden für den Import des Hauptmoduls")
+    parser.add_argument("--detail", type=int, default=10, help="Anzahl der langsamsten Einzelimporte")
+    arguments = parser.parse_args(argv)
+
+    seconds, eager = measure_import(MAIN_MODULE, HEAVY_MODULES)
+    print(f"{MAIN_MODULE}: {seconds:.3f} s (Ziel {arguments.target:.3f} s)")
+    print(f"  Beim Start geladene schwere Bibliotheken: {', '.join(eager) or 'keine'}")
+    for cumulative, name in slowest_imports(MAIN_MODULE, arguments.detail):
+        print(f"  {cumulative:8.3f} s  {name}")
+
+    print("Im Hintergrund vorgeladen:")
+    for module in HEAVY_MODULES:
+        print(f"  {measure_import(module)[0]:8.3f} s  {module}")
+
+    return 0 if seconds <= arguments.target and not eager else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#############################################################
+# Entwickler: Christopher Haase                             #
+# Kurs: Software Developer (IHK) [xxxx]                     #
+# Erstellungsdatum: 18.10.2026                              #
+# Letzte Änderung: 18.10.2026                               #
+# Version: 1.0                                              #
+# --------------------------------------------------------- #
+# Projektarbeit: Data Cleaning Tool                         #
+# Beschreibung: Messwerte je Verarbeitungsschritt (Dauer,   #
+# Zeilen, Speicher) und JSON-Protokoll aller Läufe          #
+# --------------------------------------------------------- #
+# Kontakt: me@home.com                                      #
+#############################################################
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Protokoll aller Läufe, eine JSON-Zeile je Lauf (für Auswertungen über längere Zeiträume)
+RUN_LOG_PATH = os.path.join(os.path.expanduser("~"), ".data_cleaning_tool", "runs.jsonl")
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+SLOWEST_STAGES = 3  # Schritte in der Statuszeile
+
+_run_log_lock = threading.Lock()
+
+
+def resident_bytes():
+    # Aktueller Arbeitsspeicher des Prozesses: RSS unter Linux, Working Set unter Windows;
+    # None falls nicht ermittelbar (macOS, dort nur der Höchstwert über peak_resident_bytes)
+    if sys.platform == 'win32':
+        return _working_set_bytes()
+    try:
+        with open('/proc/self/statm', encoding='ascii') as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_resident_bytes():
+    # Bisheriger Höchstwert des Arbeitsspeichers (ru_maxrss, unter macOS in Bytes, sonst in KiB), None ohne resource
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    class _ProcessMemoryCounters(ctypes.Structure):
+        # PROCESS_MEMORY_COUNTERS aus psapi.h
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+    _kernel32 = ctypes.WinDLL('kernel32')
+    _kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    _psapi = ctypes.WinDLL('psapi')
+    _psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(_ProcessMemoryCounters), wintypes.DWORD]
+    _psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+
+
+def _working_set_bytes():
+    # Working Set des eigenen Prozesses über GetProcessMemoryInfo, None falls der Aufruf fehlschlägt
+    counters = _ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not _psapi.GetProcessMemoryInfo(_kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize
+
+
+class Stage:
+    # Messung eines Schritts als Kontextmanager; name (z. B. "cache" statt "laden"), rows_in, rows_out und details
+    # können im Block gesetzt werden, Dauer und Speicheränderung werden beim Verlassen in das Protokoll übernommen
+    # (memory_delta; ohne aktuellen Wert wie unter macOS stattdessen memory_peak_delta, der Anstieg des Höchstwerts)
+    def __init__(self, run_log, name, rows_in=None):
+        self.run_log = run_log
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.details = {}
+        self.record = {'stage': name, 'parent': run_log.current(), 'rows_in': rows_in}
+
+    def __enter__(self):
+        self.run_log.stages.append(self.record)
+        self.run_log.open_stages.append(self.record['stage'])
+        self._memory = resident_bytes()
+        self._peak = peak_resident_bytes() if self._memory is None else None
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self._start
+        memory = resident_bytes() if self._memory is not None else None
+        peak = peak_resident_bytes() if self._peak is not None else None
+        self.run_log.open_stages.pop()
+        rows_in = self.rows_in
+        rows_out = self.rows_out if self.rows_out is not None else rows_in
+        self.record.update({
+            'stage': self.name,
+            'rows_in': rows_in,
+            'seconds': seconds,
+            'rows_out': rows_out,
+            'rows_dropped': rows_in - rows_out if rows_in is not None and rows_out is not None else None,
+            'memory_delta': memory - self._memory if memory is not None else None,
+        })
+        if peak is not None:
+            self.record['memory_peak_delta'] = peak - self._peak
+        self.record.update(self.details)
+        return False
+
+
+class RunLog:
+    # Messwerte eines Laufs in der Reihenfolge der Schritte; Teilschritte (z. B. einzelne Bereinigungsregeln)
+    # verweisen über parent auf den umgebenden Schritt
+    def __init__(self, source=None, report=None):
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.source = source
+        self.report = report
+        self.stages = []
+        self.open_stages = []
+
+    def stage(self, name, rows_in=None):
+        return Stage(self, name, rows_in)
+
+    def current(self):
+        # Name des gerade laufenden Schritts, None außerhalb aller Schritte
+        return self.open_stages[-1] if self.open_stages else None
+
+    def extend(self, records):
+        # Übernahme der Einträge eines anderen Protokolls (z. B. aus df.attrs['stages']) als Teilschritte
+        for record in records:
+            self.stages.append(dict(record, parent=record['parent'] or self.current()))
+
+    def timings(self):
+        # Dauer der Hauptschritte (ohne Teilschritte)
+        return {record['stage']: record['seconds'] for record in self.stages if record['parent'] is None}
+
+    def to_json(self):
+        return {'started': self.started, 'source': self.source, 'report': self.report, 'stages': self.stages}
+
+
+def append_run_log(record, path=None):
+    # Anhängen eines Laufs an das JSON-Protokoll; Fehler beim Schreiben brechen die Verarbeitung nicht ab
+    path = path or RUN_LOG_PATH
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with _run_log_lock, open(path, 'a', encoding='utf-8') as target:
+            target.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    except OSError:
+        return False
+    return True
+
+
+def describe_stage(record):
+    # Kurzbeschreibung eines Schritts: Dauer, entfernte Zeilen und aufgefüllte bzw. nicht erkannte Werte
+    text = f"{record['stage']} {record['seconds']:.2f} s"
+    if record.get('rows_dropped'):
+        text += f" (-{record['rows_dropped']:,} Zeilen)"
+    before, after = record.get('missing_before'), record.get('missing_after')
+    if before is not None and after is not None and before != after:
+        text += f" ({before - after:,} ergänzt)" if before > after else f" ({after - before:,} nicht erkannt)"
+    return text
+
+
+def describe_stages(records, parent=None, limit=SLOWEST_STAGES):
+    # Einzeilige Übersicht der langsamsten Schritte (bzw. Teilschritte eines Schritts) für die Statuszeile
+    selected = [record for record in records if record['parent'] == parent]
+    slowest = sorted(selected, key=lambda record: -record['seconds'])[:limit]
+    return ", ".join(describe_stage(record) for record in slowest)
@@ -2,7 +2,7 @@
 # Entwickler: Christopher Haase                             #
 # Kurs: Software Developer (IHK) [xxxx]                     #
 # Erstellungsdatum: 05.09.2024                              #
-# Letzte Änderung: 18.11.2024                               #
+# Letzte Änderung: 18.10.2026                               #
 # Version: 1.0                                              #
 # --------------------------------------------------------- #
 # Projektarbeit: Data Cleaning Tool                         #
@@ -14,23 +14,135 @@
 
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-import pandas as pd
 import os
 import subprocess
 import webbrowser
-import matplotlib.pyplot as plt
-from openpyxl.drawing.image import Image
-import matplotlib.ticker as ticker
-import tempfile
+import io
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import locale
+import multiprocessing
+import queue
+import threading
+from data_cleaning_startup import LazyModule, start_warm_up
+
+# Schwere Bibliotheken erst bei der ersten Verwendung laden (bzw. im Hintergrund vorladen),
+# damit das Fenster sofort erscheint; matplotlib und openpyxl werden in den Diagramm- und Exportfunktionen geladen
+pd = LazyModule('pandas')
+np = LazyModule('numpy')
+data_cleaning_aggregation = LazyModule('data_cleaning_aggregation')
+data_cleaning_cache = LazyModule('data_cleaning_cache')
+data_cleaning_dates = LazyModule('data_cleaning_dates')
+data_cleaning_dedup = LazyModule('data_cleaning_dedup')
+data_cleaning_excel = LazyModule('data_cleaning_excel')  # Alle Blätter mehrerer Excel-Dateien
+data_cleaning_memory = LazyModule('data_cleaning_memory')  # Kompaktes Schema (Kategorien, kleinere Zahlentypen)
+data_cleaning_rules = LazyModule('data_cleaning_rules')  # Duplikatspalten, Datumsformate, Zuordnungstabellen
+data_cleaning_telemetry = LazyModule('data_cleaning_telemetry')  # Messwerte je Schritt, JSON-Protokoll
 
 # Konfiguration als Konstanten
 WINDOW_TITLE = "Data Cleaning Tool"
-WINDOW_SIZE = "520x670"
+WINDOW_SIZE = "520x715"
 LABEL_FONT = "Helvetica Neue"
 BUTTON_FONT = ("Helvetica Neue", 12, "bold")
 BUTTON_COLOR = "#007AFF"
 PROGRESS_BAR_WIDTH = 415
+POLL_INTERVAL_MS = 100  # Abfrageintervall der Fortschrittsmeldungen des Hintergrund-Threads
+WARM_UP_DELAY_MS = 200  # Verzögerung des Vorladens der Bibliotheken nach dem Anzeigen des Fensters
+
+# Fortschritt nach Abschluss der einzelnen Schritte
+PROGRESS_LOADED = 0.33
+PROGRESS_CLEANED = 0.66
+
+# Zeilen je Block beim speicherschonenden Verarbeiten großer CSV-Dateien
+CHUNK_SIZE = 100_000
+
+# Zeilen je Block beim Export in die Excel-Datei
+EXPORT_BLOCK_SIZE = 10_000
+
+# Formatierung der Überschriften im Datenblatt (Rahmenstil und Ausrichtung)
+HEADER_BORDER_STYLE = 'thin'
+HEADER_ALIGNMENT = {'horizontal': 'center', 'vertical': 'top'}
+
+# Reportings im Auswahlmenü mit Beschreibung und Diagrammen (Titel, Aufteilung nach Spalte, Achsenbeschriftung),
+# alle Diagramme werden aus dem voraggregierten Würfel abgeleitet
+REPORTS = {
+    "Sales Reporting": {
+        'description': "Sales Reporting:\n"
+                       "Analyse der monatlichen Gesamtumsätze und der Einzelumsätze pro Verkäufer"
+                       " im Bereich Smartphone-Vertrieb.",
+        'charts': [
+            ("Gesamtumsatz pro Monat", None, "Gesamtumsatz in €"),
+            ("Umsatz pro Verkäufer pro Monat", 'Verkäufer', "Umsatz in €"),
+        ],
+    },
+    "Regionen & Produkte": {
+        'description': "Regionen & Produkte:\n"
+                       "Analyse der monatlichen Umsätze pro Region und pro Produkt"
+                       " im Bereich Smartphone-Vertrieb.",
+        'charts': [
+            ("Umsatz pro Region pro Monat", 'Region', "Umsatz in €"),
+            ("Umsatz pro Produkt pro Monat", 'Produkt', "Umsatz in €"),
+        ],
+    },
+}
+DEFAULT_REPORT = "Sales Reporting"
+CHART_ROW_SPACING = 33  # Abstand der Diagramme im Diagrammblatt in Zeilen
+CHART_WORKERS = os.cpu_count() or 1  # Diagramme werden parallel in Threads gerendert
+CHART_CACHE_SIZE = 32  # Anzahl zwischengespeicherter Diagrammbilder (PNG) je Prozess
+
+
+class PipelineCancelled(Exception):
+    # Abbruch der Verarbeitung durch den Benutzer
+    pass
+
+
+def report_progress(progress, fraction, text):
+    # Meldung des Fortschritts (0..1) an einen optionalen Empfänger
+    if progress is not None:
+        progress(fraction, text)
+
+
+def scale_progress(progress, start, end):
+    # Abbildung des Fortschritts eines Teilschritts auf den Abschnitt start..end
+    if progress is None:
+        return None
+    return lambda fraction, text: progress(start + (end - start) * fraction, text)
+
+
+# Bildzwischenspeicher gerenderter Diagramme und freie, wiederverwendbare Figure-Vorlagen
+_chart_cache = OrderedDict()
+_chart_cache_lock = threading.Lock()
+_chart_figures = queue.SimpleQueue()
+
+
+class ProgressChannel:
+    # Threadsichere Übermittlung von Fortschritt und Ergebnis eines Hintergrund-Threads an die GUI
+    def __init__(self):
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def __call__(self, fraction, text):
+        # Aufruf im Hintergrund-Thread, nach einem Abbruch endet die Verarbeitung an dieser Stelle
+        if self.cancel_event.is_set():
+            raise PipelineCancelled()
+        self.messages.put(('progress', fraction, text))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def start(self, task, start=0.0, end=1.0):
+        # Ausführung von task(progress) in einem Daemon-Thread, Ergebnis oder Fehler landen in der Queue
+        progress = scale_progress(self, start, end)
+
+        def run():
+            try:
+                self.messages.put(('done', task(progress), None))
+            except Exception as error:
+                self.messages.put(('error', error, None))
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
 
 
 class DataCleaningApp:
@@ -41,8 +153,16 @@ class DataCleaningApp:
             self._create_ui()
         self.data = None
         self.cleaned_data = None  # Neue Variable für bereinigte Daten
+        self.cached_data = None  # Bereits bereinigte Daten aus dem Cache
+        self.cube = None  # Voraggregierte Umsätze für die Diagramme
+        self.cache_path = None
+        self.report_path = None  # Speicherort aus Schritt 2
+        self.run_log = data_cleaning_telemetry.RunLog()  # Messwerte des laufenden Durchgangs (Schritt 1 bis 3)
         self.last_saved_path = None
         self.progress_value = 0
+        self.channel = None  # Verbindung zum laufenden Hintergrund-Thread
+        self._button_states = {}
+        self._stage_start = 0.0
 
     def _setup_window(self):
         # Initialisierung Haupteigenschaften des Fensters
@@ -83,7 +203,7 @@ class DataCleaningApp:
         selection_label.pack(pady=5)
 
         self.selection_var = ctk.StringVar(value="")
-        options = ["", "Sales Reporting"]
+        options = ["", *REPORTS]
 
         selection_menu = ctk.CTkOptionMenu(
             self.selection_frame, values=options, command=self._on_selection, variable=self.selection_var,
@@ -130,6 +250,21 @@ class DataCleaningApp:
         self.progress_label = self._create_label("0%", parent=progress_frame, font_size=10, bold=True)
         self.progress_label.pack(side="right", padx=(0, 10))
 
+        # Statuszeile mit aktuellem Verarbeitungsschritt und Abbruch
+        status_frame = ctk.CTkFrame(self.root, fg_color="#F2F2F7")
+        status_frame.pack(padx=20, fill="x")
+
+        self.status_label = self._create_label("", parent=status_frame, font_size=10)
+        self.status_label.configure(wraplength=330, justify="left")
+        self.status_label.pack(side="left", padx=(20, 0), pady=5)
+
+        self.cancel_button = ctk.CTkButton(
+            status_frame, text="Abbrechen", command=self.cancel_processing, corner_radius=8,
+            font=("Helvetica Neue", 10, "bold"), fg_color="#F2F2F7", text_color=BUTTON_COLOR,
+            hover_color="#E5E5EA", width=70, state="disabled"
+        )
+        self.cancel_button.pack(side="right", padx=(0, 10), pady=5)
+
     def _create_footer_buttons(self):
         # Erstellung Buttons Fußbereich
         help_button = ctk.CTkButton(
@@ -146,34 +281,128 @@ class DataCleaningApp:
         )
         explanation_button.pack(side="left", anchor="sw", padx=20, pady=10)
 
-    def update_progress(self, value):
-        # Aktualisierung Fortschrittsanzeige
+    def update_progress(self, value, text=None):
+        # Aktualisierung Fortschrittsanzeige und optional der Statuszeile
         self.progress_bar.set(value)
+        self.progress_label.configure(text=f"{value:.0%}")
+        if text is not None:
+            self.status_label.configure(text=text)
+
+    def _run_in_background(self, task, start, end, on_success):
+        # Ausführung eines Schritts im Hintergrund-Thread, die GUI bleibt währenddessen bedienbar
+        step_buttons = [self.load_button, self.save_button, self.process_button, self.open_button]
+        self._button_states = {button: button.cget("state") for button in step_buttons}
+        for button in step_buttons:
+            button.configure(state="disabled")
+        self.cancel_button.configure(state="normal")
+
+        self._stage_start = start
+        self.channel = ProgressChannel()
+        self.channel.start(task, start, end)
+        self.root.after(POLL_INTERVAL_MS, self._poll_progress, on_success)
+
+    def _poll_progress(self, on_success):
+        # Übernahme der Meldungen des Hintergrund-Threads (läuft im Tk-Hauptthread)
+        while True:
+            try:
+                kind, payload, text = self.channel.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                self.update_progress(payload, text)
+                continue
+
+            for button, state in self._button_states.items():
+                button.configure(state=state)
+            self.cancel_button.configure(state="disabled")
+            self.channel = None
+
+            if kind == 'done':
+                on_success(payload)
+            elif isinstance(payload, PipelineCancelled):
+                self.update_progress(self._stage_start, "Verarbeitung abgebrochen.")
+            else:
+                self.update_progress(self._stage_start, "Verarbeitung fehlgeschlagen.")
+                messagebox.showerror("Fehler", f"Verarbeitung fehlgeschlagen:\n{payload}")
+            return
+        self.root.after(POLL_INTERVAL_MS, self._poll_progress, on_success)
 
-        progress_texts = {
-            0.0: "0%",
-            0.33: "33%",
-            0.66: "66%",
-            1.0: "100%"
-        }
-        self.progress_label.configure(text=progress_texts.get(value, ""))
+    def cancel_processing(self):
+        # Abbruch des laufenden Schritts beim nächsten Zwischenstand
+        if self.channel is not None:
+            self.channel.cancel()
+            self.status_label.configure(text="Abbruch angefordert ...")
 
     def load_file(self):
-        # Laden einer CSV- oder Excel-Datei
+        # Laden einer CSV- oder Excel-Datei bzw. mehrerer Excel-Dateien (alle Blätter, mit Spalte für die Herkunft)
         if not self.selection_var.get():
             messagebox.showerror("Fehler", "Bitte Reporting auswählen.")
             return
-        file_path = filedialog.askopenfilename(
+        file_paths = filedialog.askopenfilenames(
             filetypes=[("CSV Dateien", "*.csv"), ("Excel Dateien", "*.xlsx")]
         )
-        if file_path:
-            self.data = pd.read_csv(file_path) if file_path.endswith(".csv") else pd.read_excel(file_path)
+        if not file_paths:
+            return
+        if len(file_paths) > 1 and not all(path.endswith(".xlsx") for path in file_paths):
+            messagebox.showerror("Fehler", "Mehrere Dateien können nur als Excel-Dateien geladen werden.")
+            return
+
+        self.run_log = data_cleaning_telemetry.RunLog(", ".join(file_paths), self.selection_var.get())
+
+        def load(progress):
+            # Unveränderte Quelldateien werden bereinigt aus dem Cache geladen (nur bei einer einzelnen Datei)
+            with self.run_log.stage('laden') as stage:
+                if len(file_paths) > 1:
+                    cache_path, cached_data = None, None
+                    data = data_cleaning_excel.read_workbooks(file_paths, progress)
+                else:
+                    report_progress(progress, 0.0, "Cache wird geprüft ...")
+                    cache_path = data_cleaning_cache.cache_path_for(file_paths[0])
+                    cached_data = data_cleaning_cache.load_cached(cache_path)
+                    data = cached_data if cached_data is not None else self.read_data(file_paths[0], progress)
+                stage.name = 'cache' if cached_data is not None else 'laden'
+                stage.rows_out = len(data)
+            return cache_path, cached_data, data
+
+        def loaded(result):
+            self.cache_path, self.cached_data, self.data = result
+            memory = self.data.attrs.get('memory')
+            details = f" {data_cleaning_memory.describe_memory(memory)}." if memory else ""
+            self.update_progress(PROGRESS_LOADED, f"{len(self.data):,} Zeilen geladen.{details}")
             messagebox.showinfo("Erfolg", "Datei erfolgreich geladen.")
-            self.update_progress(0.33)
             self.load_button.configure(text="Erfolgreich erledigt", fg_color="green", state="disabled")
 
+        self._run_in_background(load, 0.0, PROGRESS_LOADED, loaded)
+
+    @staticmethod
+    def read_data(file_path, progress=None):
+        # Einlesen einer CSV- oder Excel-Datei, CSV mit Fortschritt blockweise nach gelesenen Bytes, Excel mit allen
+        # Blättern parallel; Textspalten werden direkt als Kategorien gelesen, danach kompaktes Schema mit
+        # Speicherbericht in df.attrs['memory']
+        if not file_path.endswith(".csv"):
+            return data_cleaning_excel.read_workbooks([file_path], progress)
+        categories = dict.fromkeys(data_cleaning_rules.load_rules().text_columns, 'category')
+        if progress is None:
+            return data_cleaning_memory.compact_frame(pd.read_csv(file_path, dtype=categories))
+        chunks = list(DataCleaningApp._read_csv_chunks(file_path, CHUNK_SIZE, progress, dtype=categories))
+        df = data_cleaning_memory.concat_frames(chunks) if chunks else pd.read_csv(file_path, dtype=categories)
+        return data_cleaning_memory.compact_frame(df)
+
+    @staticmethod
+    def _read_csv_chunks(file_path, chunk_size, progress=None, **read_options):
+        # Blockweises Lesen einer CSV-Datei mit Meldung der gelesenen Bytes und Zeilen
+        total_bytes = max(os.path.getsize(file_path), 1)
+        rows_read = 0
+        with open(file_path, 'rb') as source:
+            for chunk in pd.read_csv(source, chunksize=chunk_size, **read_options):
+                rows_read += len(chunk)
+                bytes_read = min(source.tell(), total_bytes)
+                report_progress(progress, bytes_read / total_bytes,
+                                f"{rows_read:,} Zeilen gelesen ({bytes_read / 1e6:,.1f} MB)")
+                yield chunk
+
     def save_file(self):
-        # Speichern bereinigte Daten in Excel-Datei
+        # Bereinigung Daten und Festlegung Speicherort, geschrieben wird die Excel-Datei in Schritt 3 in einem Durchgang
         if self.data is None:
             messagebox.showerror("Fehler", "Keine Datei geladen.")
             return
@@ -181,158 +410,374 @@ class DataCleaningApp:
             defaultextension=".xlsx",
             filetypes=[("Excel Dateien", "*.xlsx"), ("Alle Dateien", "*.*")]
         )
-        if save_path:
-            self.cleaned_data = self.clean_data(self.data)
-            self.cleaned_data.to_excel(save_path, index=False)
-            self.last_saved_path = save_path
-            messagebox.showinfo("Erfolg", "Datei erfolgreich gespeichert.")
-            self.update_progress(0.66)
+        if not save_path:
+            return
+
+        def clean(progress):
+            cleaned_data = self.cached_data
+            if cleaned_data is None:
+                with self.run_log.stage('bereinigen', len(self.data)) as stage:
+                    cleaned_data = self.clean_data(self.data, scale_progress(progress, 0.0, 0.9))
+                    stage.rows_out = len(cleaned_data)
+                    self.run_log.extend(cleaned_data.attrs.get('stages', []))
+                if self.cache_path:
+                    data_cleaning_cache.store_cached(cleaned_data, self.cache_path)
+            with self.run_log.stage('aggregation', len(cleaned_data)) as stage:
+                cube = self.load_or_build_cube(cleaned_data, self.cache_path)
+                stage.details = {'aggregates': len(cube)}  # Würfelzeilen, keine entfernten Zeilen
+            report_progress(progress, 1.0, f"{len(cube):,} Aggregate berechnet")
+            return cleaned_data, cube
+
+        def cleaned(result):
+            cleaned_data, self.cube = result
+            # Weitergabe ohne Kopie; die Rohdaten werden nicht mehr benötigt und freigegeben
+            self.cleaned_data = cleaned_data
+            self.data = self.cached_data = None
+            self.report_path = save_path
+            bytes_per_row = data_cleaning_memory.frame_bytes(cleaned_data) / max(len(cleaned_data), 1)
+            steps = data_cleaning_telemetry.describe_stages(self.run_log.stages, parent='bereinigen')
+            self.update_progress(PROGRESS_CLEANED,
+                                 f"{len(cleaned_data):,} Zeilen bereinigt ({bytes_per_row:,.0f} Bytes je Zeile)."
+                                 + (f"\nLangsamste Schritte: {steps}" if steps else ""))
+            messagebox.showinfo("Erfolg", "Daten erfolgreich bereinigt. Die Datei wird in Schritt 3 gespeichert.")
             self.save_button.configure(text="Erfolgreich erledigt", fg_color="green", state="disabled")
 
-    @staticmethod
-    def _adjust_column_widths(workbook):
-        # Anpassung Spaltenbreiten an Inhalt an
-        for worksheet in workbook.worksheets:
-            for column_cells in worksheet.columns:
-                max_length = max(len(str(cell.value)) for cell in column_cells)
-                adjusted_width = (max_length + 2)
-                worksheet.column_dimensions[column_cells[0].column_letter].width = adjusted_width
+        self._run_in_background(clean, PROGRESS_LOADED, PROGRESS_CLEANED, cleaned)
 
     def process_data(self):
         # Bereinigung Daten und Erstellung Diagramme
         if self.cleaned_data is None:
             messagebox.showerror("Fehler", "Keine bereinigten Daten vorhanden. Bitte Schritt 2 ausführen.")
             return
-        self.save_charts(self.cleaned_data)
-        self.update_progress(1.0)
-        self.process_button.configure(text="Erfolgreich erledigt", fg_color="green", state="disabled")
 
-    @staticmethod
-    def clean_data(df):
-        # Bereinigung Datensatz und Korrektur Datumsformate
+        def processed(_):
+            self.last_saved_path = self.report_path
+            data_cleaning_telemetry.append_run_log(self.run_log.to_json())
+            steps = data_cleaning_telemetry.describe_stages(self.run_log.stages, parent='report')
+            self.update_progress(1.0, f"Bereinigte Datei gespeichert.\nLangsamste Schritte: {steps}")
+            messagebox.showinfo("Erfolg", "Daten erfolgreich bereinigt und Diagramme hinzugefügt.")
+            self.process_button.configure(text="Erfolgreich erledigt", fg_color="green", state="disabled")
 
-        # Entfernen von doppelten Einträgen, außer dem Kommentar
-        df = df.drop_duplicates(
-            subset=['Datum', 'Verkäufer', 'Region', 'Produkt', 'Verkaufte Menge', 'Umsatz pro Einheit', 'Gesamtumsatz'],
-            keep='first'
-        ).copy()
+        data, report = self.cleaned_data, self.selection_var.get()
+        self._run_in_background(lambda progress: self.save_charts(data, progress, report), PROGRESS_CLEANED, 1.0,
+                                processed)
 
-        # Bereinigung Datum und Konvertierung
-        def parse_date(date):
-            try:
-                return pd.to_datetime(date, errors='coerce').strftime('%Y-%m-%d')
-            except ValueError:
-                return None
-
-        # Direkte Zuweisung zu einer Spalte
-        df.loc[:, 'Datum'] = df['Datum'].apply(parse_date)
-
-        # Ausfüllen fehlender Datumsangaben mit nächst gültigem Datum
-        df.loc[:, 'Datum'] = df['Datum'].ffill()
-
-        # Ausfüllen fehlender Verkäufernamen basierend auf Region
-        def fill_verkaeufer(row):
-            if pd.isna(row['Verkäufer']):
-                if row['Region'] == 'AMERICAS':
-                    return 'Peter Schmidt'
-                elif row['Region'] == 'EMEA':
-                    return 'Stefan Berger'
-                elif row['Region'] == 'ASIA':
-                    return 'Dirk Donner'
-            return row['Verkäufer']
-
-        df.loc[:, 'Verkäufer'] = df.apply(fill_verkaeufer, axis=1)
-
-        # Einheitliche Schreibweise der Verkäufernamen
-        df.loc[:, 'Verkäufer'] = df['Verkäufer'].str.title()
-
-        # Ausfüllen fehlender Regionsnamen basierend auf Verkäufer
-        def fill_region(row):
-            if pd.isna(row['Region']):
-                if row['Verkäufer'] == 'Peter Schmidt':
-                    return 'AMERICAS'
-                elif row['Verkäufer'] == 'Stefan Berger':
-                    return 'EMEA'
-                elif row['Verkäufer'] == 'Dirk Donner':
-                    return 'ASIA'
-            return row['Region']
-
-        df.loc[:, 'Region'] = df.apply(fill_region, axis=1)
-
-        # Berechnung Monat und Gesamtumsatz
-        df.loc[:, 'Monat'] = pd.to_datetime(df['Datum']).dt.to_period('M')
-        df.loc[:, 'Gesamtumsatz'] = df['Verkaufte Menge'] * df['Umsatz pro Einheit']
+    @staticmethod
+    def clean_data(df, progress=None, rules=None, key_index=None):
+        # Bereinigung Datensatz nach den konfigurierten Regeln (vektorisiert, ohne zeilenweise apply-Aufrufe);
+        # key_index: bereits gesehene Schlüssel anderer Dateien bzw. früherer Läufe (data_cleaning_dedup.KeyIndex)
+        rules = rules or data_cleaning_rules.load_rules()
+
+        # Entfernen von doppelten Einträgen über normalisierte Schlüssel, außer dem Kommentar
+        # (take legt genau eine neue Tabelle an); der Bericht steht in df.attrs['duplicates'],
+        # die Messwerte aller Teilschritte in df.attrs['stages']
+        run_log = data_cleaning_telemetry.RunLog()
+        with run_log.stage('duplikate', len(df)) as stage:
+            keys = data_cleaning_dedup.duplicate_keys(df, rules)
+            keep, duplicates = data_cleaning_dedup.select_new(keys, key_index)
+            df = df.take(np.flatnonzero(keep))
+            stage.rows_out = len(df)
+        df.attrs['duplicates'] = duplicates
+        report_progress(progress, 0.2, data_cleaning_dedup.describe_report(duplicates))
+        return DataCleaningApp._clean_rows(df, progress=scale_progress(progress, 0.2, 1.0), rules=rules,
+                                           run_log=run_log)
 
+    @staticmethod
+    def _clean_rows(df, last_values=None, progress=None, rules=None, run_log=None):
+        # Bereinigung bereits deduplizierter Zeilen; jede Regel ist eine vektorisierte Operation über alle
+        # Zeilen, last_values (Spalte -> letzter gültiger Wert) setzt das Auffüllen über Blockgrenzen hinweg fort;
+        # Dauer, Speicheränderung und fehlende Werte vor und nach jeder Regel stehen in df.attrs['stages']
+        rules = rules or data_cleaning_rules.load_rules()
+        run_log = run_log or data_cleaning_telemetry.RunLog()
+        for number, rule in enumerate(rules.rules, start=1):
+            column = rule.get('target', rule.get('column'))
+            with run_log.stage(f"{rule['rule']} {column}", len(df)) as stage:
+                missing = int(df[column].isna().sum()) if column in df else None
+                details = DataCleaningApp._apply_rule(df, rule, rules, last_values or {})
+                stage.details = {'missing_before': missing, 'missing_after': int(df[column].isna().sum())}
+            description = data_cleaning_rules.describe(rule)
+            if details:
+                description = f"{description}: {details}"
+            report_progress(progress, number / len(rules.rules), description)
+        df.attrs['stages'] = run_log.stages
+        report_progress(progress, 1.0, f"{len(df):,} Zeilen bereinigt")
         return df
 
-    def save_charts(self, df):
-        # Erstellung Balkendiagramme und Speicherung in Excel-Datei
-        # Darstellung Monate auf Deutsch
-        locale.setlocale(locale.LC_TIME, 'de_DE.UTF-8')
-
-        df['Monat'] = pd.to_datetime(df['Datum']).dt.to_period('M')
-        df['Gesamtumsatz'] = df['Verkaufte Menge'] * df['Umsatz pro Einheit']
-
-        monthly_sales = df.groupby('Monat')['Gesamtumsatz'].sum()
-
-        # Erstellung erstes Diagramm: Gesamtumsatz pro Monat
-        fig, ax = plt.subplots(figsize=(10, 6))
-        monthly_sales.plot(kind='bar', ax=ax)
-        ax.set_xticklabels([period.strftime('%B %Y') for period in monthly_sales.index], rotation=45, ha="right")
-        ax.yaxis.set_major_formatter(ticker.FuncFormatter(lambda x, _: f'{x:,.0f} €'))
-        ax.set_title("Gesamtumsatz pro Monat")
-        ax.set_xlabel("Monat")
-        ax.set_ylabel("Gesamtumsatz in €")
-        ax.grid(True)
-
-        # Speicherung des ersten Diagramms
-        temp_file_1 = os.path.join(tempfile.gettempdir(), "chart1.png")
-        plt.tight_layout()
-        plt.savefig(temp_file_1)
-        plt.close()
-
-        # Erstellung zweites Diagramm: Umsatz pro Verkäufer pro Monat
-        seller_monthly_sales = df.groupby(['Monat', 'Verkäufer'])['Gesamtumsatz'].sum().unstack()
-
-        fig2, ax2 = plt.subplots(figsize=(10, 6))
-        seller_monthly_sales.plot(kind='bar', stacked=True, ax=ax2)
-        ax2.set_xticklabels([period.strftime('%B %Y') for period in seller_monthly_sales.index], rotation=45,
-                            ha="right")
-        ax2.yaxis.set_major_formatter(ticker.FuncFormatter(lambda x, _: f'{x:,.0f} €'))
-        ax2.set_title("Umsatz pro Verkäufer pro Monat")
-        ax2.set_xlabel("Monat")
-        ax2.set_ylabel("Umsatz in €")
-        ax2.grid(True)
-
-        # Speicherung des zweiten Diagramms
-        temp_file_2 = os.path.join(tempfile.gettempdir(), "chart2.png")
-        plt.tight_layout()
-        plt.savefig(temp_file_2)
-        plt.close()
-
-        # Export aller Diagramme in Excel-Datei
-        if self.last_saved_path:
-            with pd.ExcelWriter(self.last_saved_path, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Bereinigte Daten', index=False)
-                workbook = writer.book
-                worksheet = workbook.create_sheet(title="Umsatzdiagramm")
+    @staticmethod
+    def _apply_rule(df, rule, rules, last_values):
+        # Anwenden einer einzelnen Regel auf alle Zeilen, Rückgabe einer Beschreibung des Ergebnisses (optional);
+        # der Bericht der Datumserkennung (Zeilen je Format, nicht erkannte Zeilen) steht in df.attrs
+        kind = rule['rule']
+        if kind == 'parse_dates':
+            dates, report = data_cleaning_dates.parse_dates(df[rule['column']], rules.date_formats)
+            df[rule['column']] = dates
+            df.attrs.setdefault('date_reports', {})[rule['column']] = report
+            return data_cleaning_dates.describe_report(report)
+        elif kind == 'fill_forward':
+            # Ausfüllen fehlender Werte mit dem letzten gültigen Wert, auch aus dem vorherigen Block
+            df[rule['column']] = DataCleaningApp._fill_forward(df[rule['column']], last_values.get(rule['column']))
+        elif kind == 'fill_from_lookup':
+            lookup = rules.lookups[rule['table']]
+            df[rule['target']] = DataCleaningApp._fill_from_lookup(df[rule['target']], df[rule['source']], lookup)
+        elif kind == 'title_case':
+            df[rule['column']] = data_cleaning_memory.title_case(df[rule['column']])
+        elif kind == 'month':
+            df[rule['column']] = pd.to_datetime(df[rule['source']]).dt.to_period('M')
+        elif kind == 'multiply':
+            # Berechnung in int64/float64, die verkleinerten Typen der Quellspalten könnten überlaufen
+            product = data_cleaning_memory.widen(df[rule['factors'][0]])
+            for factor in rule['factors'][1:]:
+                product = product * data_cleaning_memory.widen(df[factor])
+            df[rule['column']] = product
+        return None
+
+    @staticmethod
+    def _last_values(df, rules, last_values=None):
+        # Letzte gültige Werte der aufgefüllten Spalten nach einem Block, für den nächsten Block
+        last_values = dict(last_values or {})
+        for rule in rules.rules:
+            if rule['rule'] == 'fill_forward' and df[rule['column']].notna().any():
+                value = df[rule['column']].dropna().iloc[-1]
+                if isinstance(value, pd.Timestamp):
+                    value = value.isoformat()  # JSON-tauglich für den Zustand der inkrementellen Verarbeitung
+                last_values[rule['column']] = value.item() if hasattr(value, 'item') else value
+        return last_values
+
+    @staticmethod
+    def _fill_forward(values, last_value=None):
+        # Ausfüllen fehlender Werte mit dem Vorgänger; fehlende Werte am Anfang mit dem letzten Wert des vorherigen
+        # Blocks (Datum als Zeitpunkt, bei Kategorien wird der Wert bei Bedarf als Kategorie ergänzt)
+        filled = values.ffill()
+        if last_value is None or not filled.isna().any():
+            return filled
+        if pd.api.types.is_datetime64_dtype(values.dtype):
+            last_value = pd.Timestamp(last_value)
+        elif isinstance(values.dtype, pd.CategoricalDtype) and last_value not in values.cat.categories:
+            filled = data_cleaning_memory.sort_categories(filled.cat.add_categories([last_value]))
+        return filled.fillna(last_value)
+
+    @staticmethod
+    def clean_csv_in_chunks(input_path, output_path, chunk_size=CHUNK_SIZE, progress=None, key_index=None):
+        # Blockweise Bereinigung großer CSV-Dateien mit begrenztem Speicherbedarf, Duplikate und fehlende
+        # Werte werden über Blockgrenzen (und mit key_index über Dateien) hinweg erkannt;
+        # Rückgabe der geschriebenen Zeilen und des Duplikatberichts
+        rules = data_cleaning_rules.load_rules()
+        seen = data_cleaning_dedup.KeyIndex()
+        duplicates = None
+        last_values = {}
+        rows_written = 0
+
+        with open(output_path, 'w', newline='', encoding='utf-8') as output:
+            text_columns = dict.fromkeys(rules.text_columns, object)
+            for chunk in DataCleaningApp._read_csv_chunks(input_path, chunk_size, progress, dtype=text_columns):
+                keys = data_cleaning_dedup.duplicate_keys(chunk, rules)
+                is_new, chunk_duplicates = data_cleaning_dedup.select_new(keys, key_index, seen)
+                duplicates = data_cleaning_dedup.merge_reports(duplicates, chunk_duplicates)
+
+                cleaned = DataCleaningApp._clean_rows(chunk[is_new].copy(), last_values, rules=rules)
+                last_values = DataCleaningApp._last_values(cleaned, rules, last_values)
+
+                cleaned.to_csv(output, index=False, header=output.tell() == 0)
+                rows_written += len(cleaned)
+
+        return rows_written, duplicates
+
+    @staticmethod
+    def _fill_from_lookup(target, source, lookup):
+        # Ausfüllen fehlender Werte über eine vorkompilierte Zuordnungstabelle, unbekannte Werte bleiben leer;
+        # bei Kategorien werden die ergänzten Werte als Kategorien hinzugefügt
+        mapped = lookup.map(source)
+        fill = target.isna() & mapped.notna()
+        if isinstance(target.dtype, pd.CategoricalDtype):
+            added = pd.Index(mapped[fill].unique()).difference(target.cat.categories)
+            target = data_cleaning_memory.sort_categories(target.cat.add_categories(added))
+        return target.mask(fill, mapped.where(fill))  # Nur die ergänzten Werte müssen Kategorien sein
+
+    def save_charts(self, df, progress=None, report=DEFAULT_REPORT):
+        # Erstellung Balkendiagramme und Speicherung in Excel-Datei (ohne Dialoge, auch im Hintergrund-Thread)
+        with self.run_log.stage('report', len(df)):
+            self.write_report(df, self.report_path, progress, report, self.cube, self.run_log)
+
+    @staticmethod
+    def _set_german_locale():
+        # Darstellung Monate auf Deutsch, sofern das Gebietsschema installiert ist
+        try:
+            locale.setlocale(locale.LC_TIME, 'de_DE.UTF-8')
+        except locale.Error:
+            pass
+
+    @staticmethod
+    def write_report(df, report_path, progress=None, report=DEFAULT_REPORT, cube=None, run_log=None):
+        # Erstellung Balkendiagramme aus dem Würfel und Speicherung mit den Daten in Excel-Datei (ohne Dialoge);
+        # run_log: optionales Protokoll für die Messwerte der einzelnen Schritte
+        run_log = run_log or data_cleaning_telemetry.RunLog()
+        if cube is None:
+            with run_log.stage('aggregation', len(df)) as stage:
+                cube = data_cleaning_aggregation.build_cube(df)
+                stage.details = {'aggregates': len(cube)}  # Würfelzeilen, keine entfernten Zeilen
+
+        with run_log.stage('diagramme'):
+            images = DataCleaningApp.render_charts(cube, report, scale_progress(progress, 0.0, 0.2))
+
+        # Export aller Diagramme und Daten in Excel-Datei
+        if report_path:
+            with run_log.stage('spaltenbreiten', len(df)):
+                column_widths = DataCleaningApp._column_widths(df)
+            with run_log.stage('export', len(df)):
+                DataCleaningApp.export_report(df, report_path, images, scale_progress(progress, 0.2, 1.0),
+                                              column_widths)
 
-                # Hinzufügen erstes Diagramm
-                img1 = Image(temp_file_1)
-                worksheet.add_image(img1, 'A1')
+    @staticmethod
+    def render_charts(cube, report=DEFAULT_REPORT, progress=None):
+        # Paralleles Rendern aller Diagramme eines Reportings aus dem Würfel als PNG im Speicher
+        # samt Position im Diagrammblatt; keine Dateien, parallele Läufe können sich nicht überschreiben
+        DataCleaningApp._set_german_locale()
+        charts = REPORTS[report]['charts']
+        images = [None] * len(charts)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(CHART_WORKERS, len(charts)))) as executor:
+            futures = {
+                executor.submit(DataCleaningApp._render_chart, data_cleaning_aggregation.monthly_totals(cube, column),
+                                title, ylabel, column is not None): position
+                for position, (title, column, ylabel) in enumerate(charts)
+            }
+            for finished, future in enumerate(as_completed(futures), start=1):
+                position = futures[future]
+                images[position] = (io.BytesIO(future.result()), f"A{1 + CHART_ROW_SPACING * position}")
+                report_progress(progress, finished / len(charts), f"{finished} von {len(charts)} Diagrammen erstellt")
+        return images
 
-                # Hinzufügen zweites Diagramm
-                img2 = Image(temp_file_2)
-                worksheet.add_image(img2, 'A34')
+    @staticmethod
+    def _render_chart(chart_data, title, ylabel, stacked):
+        # Balkendiagramm der Monatswerte als PNG; gleiche Diagramme (z. B. erneuter Export oder
+        # anderes Reporting mit gemeinsamen Diagrammen) kommen aus dem Bildzwischenspeicher
+        labels = [period.strftime('%B %Y') for period in chart_data.index]
+        key = (title, ylabel, stacked, tuple(labels), chart_data.to_csv())
+        with _chart_cache_lock:
+            if key in _chart_cache:
+                _chart_cache.move_to_end(key)
+                return _chart_cache[key]
+
+        import matplotlib.ticker as ticker
+
+        fig = DataCleaningApp._chart_figure()
+        try:
+            ax = fig.subplots()
+            if not chart_data.empty:  # leeres Diagramm, z. B. wenn alle Zeilen aus anderen Dateien bekannt sind
+                chart_data.plot(kind='bar', stacked=stacked, ax=ax)
+            ax.set_xticklabels(labels, rotation=45, ha="right")
+            ax.yaxis.set_major_formatter(ticker.FuncFormatter(lambda x, _: f'{x:,.0f} €'))
+            ax.set_title(title)
+            ax.set_xlabel("Monat")
+            ax.set_ylabel(ylabel)
+            ax.grid(True)
+            fig.tight_layout()
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png')
+        finally:
+            fig.clear()
+            _chart_figures.put(fig)
+
+        with _chart_cache_lock:
+            _chart_cache[key] = buffer.getvalue()
+            while len(_chart_cache) > CHART_CACHE_SIZE:
+                _chart_cache.popitem(last=False)
+        return buffer.getvalue()
 
-                self._adjust_column_widths(workbook)
-                workbook._sheets = [worksheet] + [workbook['Bereinigte Daten']]
+    @staticmethod
+    def clear_chart_cache():
+        # Leeren des Bildzwischenspeichers, z. B. für Laufzeitmessungen des Renderns
+        with _chart_cache_lock:
+            _chart_cache.clear()
 
-            # Löschung temporärer Dateien
-            os.remove(temp_file_1)
-            os.remove(temp_file_2)
+    @staticmethod
+    def _chart_figure():
+        # Freie Figure-Vorlage mit nicht-interaktivem Agg-Canvas (ohne pyplot und GUI-Backend), jede
+        # Figure wird von genau einem Thread zugleich genutzt; neue Vorlagen nur bei Bedarf
+        try:
+            return _chart_figures.get_nowait()
+        except queue.Empty:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            fig = Figure(figsize=(10, 6))
+            FigureCanvasAgg(fig)
+            return fig
 
-        messagebox.showinfo("Erfolg", "Daten erfolgreich bereinigt und Diagramme hinzugefügt.")
+    @staticmethod
+    def load_or_build_cube(cleaned_data, cache_path=None):
+        # Würfel aus dem Cache, sonst einmalig aus den bereinigten Daten berechnet und zwischengespeichert
+        cube_path = data_cleaning_cache.cube_path_for(cache_path) if cache_path else None
+        cube = data_cleaning_cache.load_cached(cube_path) if cube_path else None
+        if cube is None:
+            cube = data_cleaning_aggregation.build_cube(cleaned_data)
+            if cube_path:
+                data_cleaning_cache.store_cached(cube, cube_path)
+        return cube
+
+    @staticmethod
+    def export_report(df, report_path, images=(), progress=None, column_widths=None):
+        # Schreiben von Diagrammblatt und Datenblatt in einem Durchgang; die Arbeitsmappe im
+        # write-only Modus schreibt Zeilen direkt in die Datei, der Speicherbedarf hängt nicht von der Zeilenzahl ab
+        # (column_widths: bereits bekannte Spaltenbreiten, z. B. aus der inkrementellen Verarbeitung)
+        from openpyxl import Workbook
+        from openpyxl.drawing.image import Image
+        from openpyxl.utils import get_column_letter
+
+        workbook = Workbook(write_only=True)
+
+        chart_sheet = workbook.create_sheet(title="Umsatzdiagramm")
+        for image, anchor in images:
+            chart_sheet.add_image(Image(image), anchor)
+
+        data_sheet = workbook.create_sheet(title="Bereinigte Daten")
+        for position, width in enumerate(column_widths or DataCleaningApp._column_widths(df), start=1):
+            data_sheet.column_dimensions[get_column_letter(position)].width = width
+        data_sheet.append([DataCleaningApp._header_cell(data_sheet, column) for column in df.columns])
+
+        for start in range(0, len(df), EXPORT_BLOCK_SIZE):
+            block = df.iloc[start:start + EXPORT_BLOCK_SIZE]
+            for row in zip(*(DataCleaningApp._excel_values(block[column]) for column in block.columns)):
+                data_sheet.append(row)
+            rows_written = start + len(block)
+            report_progress(progress, 0.9 * rows_written / len(df),
+                            f"{rows_written:,} von {len(df):,} Zeilen geschrieben")
+
+        workbook.save(report_path)
+        report_progress(progress, 1.0, f"{os.path.getsize(report_path) / 1e6:,.1f} MB gespeichert")
+
+    @staticmethod
+    def _excel_values(series):
+        # Umwandlung einer Spalte in Excel-taugliche Python-Werte, fehlende Werte als leere Zellen;
+        # Datum wie bisher als Text JJJJ-MM-TT
+        if isinstance(series.dtype, pd.PeriodDtype):
+            series = series.astype(str).where(series.notna())
+        elif pd.api.types.is_datetime64_dtype(series.dtype):
+            series = series.dt.strftime('%Y-%m-%d')
+        return series.astype(object).where(series.notna(), None).tolist()
+
+    @staticmethod
+    def _column_widths(df):
+        # Spaltenbreiten aus Überschrift und längstem Wert je Spalte, berechnet auf den unterschiedlichen Werten
+        widths = []
+        for column in df.columns:
+            values = pd.Series(DataCleaningApp._excel_values(df[column].drop_duplicates()), dtype=object)
+            lengths = values.map(lambda value: 0 if value is None else len(str(value)))
+            widths.append(max([len(str(column)), *lengths]) + 2)
+        return widths
+
+    @staticmethod
+    def _header_cell(worksheet, value):
+        # Überschriftenzelle im Stil des bisherigen pandas-Exports (fett, umrandet, zentriert)
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, Side
+
+        side = Side(style=HEADER_BORDER_STYLE)
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.font = Font(bold=True)
+        cell.border = Border(left=side, right=side, top=side, bottom=side)
+        cell.alignment = Alignment(**HEADER_ALIGNMENT)
+        return cell
 
     def open_file(self):
         # Öffnen zuletzt gespeicherte Datei
@@ -380,19 +825,16 @@ class DataCleaningApp:
             self.open_button.configure(
                 text="Datei öffnen", fg_color=BUTTON_COLOR, state="normal"
             )
-            self.update_progress(0.0)
+            self.update_progress(0.0, "")
         else:
             self.load_button.configure(command=self.load_file)
-            if selected_option == "Sales Reporting":
-                self.header_label.configure(
-                    text="Sales Reporting:\n"
-                         "Analyse der monatlichen Gesamtumsätze und der Einzelumsätze pro Verkäufer"
-                         " im Bereich Smartphone-Vertrieb."
-                )
+            self.header_label.configure(text=REPORTS[selected_option]['description'])
             self.header_label.pack(pady=8, after=self.selection_frame)
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Prozesse zum Lesen der Excel-Blätter auch in der gepackten Anwendung
     main_root = ctk.CTk()  # Erstellung Hauptfenster
     app = DataCleaningApp(main_root)
+    main_root.after(WARM_UP_DELAY_MS, start_warm_up)  # Bibliotheken laden, sobald das Fenster angezeigt wird
     main_root.mainloop()
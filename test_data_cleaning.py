@@ -2,7 +2,7 @@
 # Entwickler: Christopher Haase                             #
 # Kurs: Software Developer (IHK) [xxxx]                     #
 # Erstellungsdatum: 30.10.2024                              #
-# Letzte Änderung: 19.11.2024                               #
+# Letzte Änderung: 18.10.2026                               #
 # Version: 1.0                                              #
 # --------------------------------------------------------- #
 # Projektarbeit: Data Cleaning and Transformation Pipeline  #
@@ -12,9 +12,32 @@
 #############################################################
 
 
+import json
+import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+import tempfile
 import unittest
+from unittest import mock
+import numpy as np
 import pandas as pd
-from data_cleaning_tool import DataCleaningApp  # Importiere dein Hauptprogramm
+from openpyxl import load_workbook
+from data_cleaning_tool import DataCleaningApp, PipelineCancelled, ProgressChannel  # Importiere dein Hauptprogramm
+import data_cleaning_cli
+import data_cleaning_cache
+import data_cleaning_aggregation
+import data_cleaning_incremental
+import data_cleaning_benchmark
+import data_cleaning_startup
+import data_cleaning_rules
+import data_cleaning_dates
+import data_cleaning_memory
+import data_cleaning_dedup
+import data_cleaning_excel
+import data_cleaning_server
+import data_cleaning_telemetry
 
 
 class TestDataCleaningApp(unittest.TestCase):
@@ -41,8 +64,8 @@ class TestDataCleaningApp(unittest.TestCase):
         # Überprüfen, ob fehlende Regionen korrekt ergänzt wurden
         self.assertEqual(cleaned_df['Region'].iloc[0], 'AMERICAS')
 
-        # Überprüfen, ob das Datum korrekt formatiert wurde
-        self.assertEqual(cleaned_df['Datum'].iloc[0], '2024-01-25')
+        # Überprüfen, ob das Datum korrekt als Datum eingelesen wurde
+        self.assertEqual(cleaned_df['Datum'].iloc[0], pd.Timestamp('2024-01-25'))
 
     def test_drop_duplicates(self):
         # Duplikate im DataFrame hinzufügen
@@ -59,10 +82,692 @@ class TestDataCleaningApp(unittest.TestCase):
         cleaned_df = self.app.clean_data(self.df)
         self.assertEqual(cleaned_df['Gesamtumsatz'].iloc[0], 57 * 1449)
 
+    def test_fill_missing_seller(self):
+        # Fehlender Verkäufer wird über die Region ergänzt, unbekannte Regionen bleiben leer
+        self.df.loc[1, 'Verkäufer'] = None
+        self.df.loc[2, ['Verkäufer', 'Region']] = [None, 'LATAM']
+        cleaned_df = self.app.clean_data(self.df)
+        self.assertEqual(cleaned_df['Verkäufer'].iloc[1], 'Stefan Berger')
+        self.assertTrue(pd.isna(cleaned_df['Verkäufer'].iloc[2]))
+
+    def test_parse_repeated_and_invalid_dates(self):
+        # Wiederholte Datumswerte werden einheitlich geparst, ungültige mit dem Vortag aufgefüllt
+        self.df['Datum'] = ['01/25/2024', 'kein Datum', '01/25/2024']
+        cleaned_df = self.app.clean_data(self.df)
+        self.assertEqual(cleaned_df['Datum'].dt.strftime('%Y-%m-%d').tolist(), ['2024-01-25'] * 3)
+
+    def test_clean_csv_in_chunks(self):
+        # Blockweise Bereinigung erkennt Duplikate und fehlende Datumsangaben über Blockgrenzen
+        self.df.loc[1, 'Datum'] = None
+        df_with_duplicates = pd.concat([self.df, pd.DataFrame([self.df.iloc[0]])], ignore_index=True)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, 'input.csv')
+            output_path = os.path.join(temp_dir, 'output.csv')
+            df_with_duplicates.to_csv(input_path, index=False)
+
+            rows, duplicates = self.app.clean_csv_in_chunks(input_path, output_path, chunk_size=1)
+            cleaned_df = pd.read_csv(output_path)
+
+        self.assertEqual(rows, len(self.df))
+        self.assertEqual(duplicates, {'rows': len(self.df) + 1, 'duplicates': 1, 'known': 0})
+        self.assertEqual(cleaned_df['Datum'].tolist(), ['2024-01-25', '2024-01-25', '2024-01-27'])
+
+    def test_cube_matches_raw_groupby(self):
+        # Aus dem Würfel abgeleitete Monatssummen entsprechen einem groupby über die Rohzeilen
+        self.df.loc[2, 'Verkäufer'] = None
+        self.df.loc[2, 'Region'] = None
+        cleaned_df = self.app.clean_data(self.df)
+        cube = data_cleaning_aggregation.build_cube(cleaned_df)
+
+        self.assertEqual(cube['Anzahl'].sum(), len(cleaned_df))
+        pd.testing.assert_series_equal(data_cleaning_aggregation.monthly_totals(cube),
+                                       cleaned_df.groupby('Monat')['Gesamtumsatz'].sum())
+        pd.testing.assert_frame_equal(
+            data_cleaning_aggregation.monthly_totals(cube, 'Verkäufer'),
+            cleaned_df.groupby(['Monat', 'Verkäufer'])['Gesamtumsatz'].sum().unstack()
+        )
+
+    def test_export_report(self):
+        # Export in einem Durchgang: Diagrammblatt zuerst, Spaltenbreiten aus den Daten
+        cleaned_df = self.app.clean_data(self.df)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_path = os.path.join(temp_dir, 'report.xlsx')
+            self.app.export_report(cleaned_df, report_path)
+            workbook = load_workbook(report_path)
+
+        self.assertEqual(workbook.sheetnames, ['Umsatzdiagramm', 'Bereinigte Daten'])
+        worksheet = workbook['Bereinigte Daten']
+        self.assertEqual(worksheet.max_row, len(cleaned_df) + 1)
+        self.assertEqual(worksheet['A2'].value, '2024-01-25')
+        self.assertEqual(worksheet['I2'].value, '2024-01')
+        self.assertEqual(worksheet.column_dimensions['D'].width, len('Samsung Galaxy S24 Ultra') + 2)
+
+    def test_render_charts_in_memory(self):
+        # Diagramme werden als PNG im Speicher erzeugt, untereinander angeordnet und bei gleichen Daten wiederverwendet
+        cube = data_cleaning_aggregation.build_cube(self.app.clean_data(self.df))
+        images = self.app.render_charts(cube, "Regionen & Produkte")
+        self.assertEqual([anchor for _, anchor in images], ['A1', 'A34'])
+        self.assertTrue(all(image.getvalue().startswith(b'\x89PNG') for image, _ in images))
+
+        repeated = self.app.render_charts(cube, "Regionen & Produkte")
+        self.assertEqual([image.getvalue() for image, _ in repeated], [image.getvalue() for image, _ in images])
+
+    def test_clean_data_progress(self):
+        # Fortschritt wird schrittweise und aufsteigend bis 100% gemeldet
+        messages = []
+        self.app.clean_data(self.df, progress=lambda fraction, text: messages.append(fraction))
+        self.assertGreater(len(messages), 2)
+        self.assertEqual(messages, sorted(messages))
+        self.assertEqual(messages[-1], 1.0)
+
+    def test_progress_channel(self):
+        # Fortschritt und Ergebnis des Hintergrund-Threads landen threadsicher in der Queue
+        channel = ProgressChannel()
+        channel.start(lambda progress: self.app.clean_data(self.df, progress), 0.33, 0.66).join()
+        messages = list(channel.messages.queue)
+        self.assertEqual(messages[-1][0], 'done')
+        self.assertEqual(messages[-2][1], 0.66)
+        self.assertTrue(all(0.33 <= fraction <= 0.66 for kind, fraction, _ in messages[:-1]))
+
+    def test_progress_channel_cancel(self):
+        # Nach dem Abbruch endet die Verarbeitung bei der nächsten Fortschrittsmeldung
+        channel = ProgressChannel()
+        channel.cancel()
+        channel.start(lambda progress: self.app.clean_data(self.df, progress)).join()
+        kind, error, _ = channel.messages.get_nowait()
+        self.assertEqual(kind, 'error')
+        self.assertIsInstance(error, PipelineCancelled)
+
     def tearDown(self):
         # Hier könntest du Aufräumarbeiten durchführen, wenn nötig
         pass
 
 
+class TestDataCleaningCli(unittest.TestCase):
+
+    def setUp(self):
+        # Temporäres Verzeichnis mit einer Quelldatei und einer nicht unterstützten Datei
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.temp_dir.name, 'verkauf.csv')
+        pd.DataFrame({
+            'Datum': ['01/25/2024', '2024-02-26'],
+            'Verkäufer': ['Peter Schmidt', None],
+            'Region': ['AMERICAS', 'EMEA'],
+            'Produkt': ['Apple iPhone 16 Pro Max', 'Samsung Galaxy S24 Ultra'],
+            'Verkaufte Menge': [57, 29],
+            'Umsatz pro Einheit': [1449, 1239],
+            'Gesamtumsatz': [82593, 35931],
+            'Kommentar': [None, None]
+        }).to_csv(self.input_path, index=False)
+        open(os.path.join(self.temp_dir.name, 'notizen.txt'), 'w').close()
+
+    def test_collect_input_files(self):
+        # Verzeichnisse werden nach CSV- und Excel-Dateien durchsucht
+        self.assertEqual(data_cleaning_cli.collect_input_files([self.temp_dir.name]), [self.input_path])
+
+    def test_process_file(self):
+        # Eine Datei wird ohne GUI bereinigt und als Excel-Report gespeichert
+        result = data_cleaning_cli.process_file(self.input_path, self.temp_dir.name, cache_dir=self.temp_dir.name)
+        self.assertTrue(os.path.exists(result['output']))
+        self.assertEqual((result['rows_in'], result['rows_out']), (2, 2))
+        self.assertEqual(set(result['timings']), {'laden', 'bereinigen', 'aggregation', 'report'})
+
+        # Zweiter Lauf mit unveränderter Quelldatei nutzt den Cache
+        result = data_cleaning_cli.process_file(self.input_path, self.temp_dir.name, cache_dir=self.temp_dir.name)
+        self.assertTrue(result['cached'])
+        self.assertEqual(set(result['timings']), {'cache', 'aggregation', 'report'})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+
+class TestDataCleaningCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.temp_dir.name, 'verkauf.csv')
+        with open(self.input_path, 'w') as source:
+            source.write('Datum,Verkäufer\n01/25/2024,Peter Schmidt\n')
+
+    def test_round_trip(self):
+        # Bereinigte Daten werden verlustfrei gespeichert und geladen
+        df = pd.DataFrame({
+            'Datum': pd.to_datetime(['2024-01-25', None, '2024-02-01']),
+            'Verkäufer': ['Peter Schmidt', float('nan'), 'Dirk Donner'],
+            'Verkaufte Menge': [57, 29, 152],
+            'Umsatz pro Einheit': [1449.0, 1239.5, 1499.0],
+        }, index=[0, 2, 5])
+        df['Monat'] = df['Datum'].dt.to_period('M')
+        cache_path = data_cleaning_cache.cache_path_for(self.input_path, self.temp_dir.name)
+
+        self.assertIsNone(data_cleaning_cache.load_cached(cache_path))
+        self.assertTrue(data_cleaning_cache.store_cached(df, cache_path))
+        pd.testing.assert_frame_equal(data_cleaning_cache.load_cached(cache_path), df)
+        with np.load(cache_path) as archive:
+            self.assertEqual(archive['c0'].dtype, np.int32)  # Datum als Tage seit 1970
+
+    def test_changed_source_invalidates(self):
+        # Geänderter Dateiinhalt ergibt einen neuen Cache-Eintrag
+        cache_path = data_cleaning_cache.cache_path_for(self.input_path, self.temp_dir.name)
+        with open(self.input_path, 'a') as source:
+            source.write('01/26/2024,Dirk Donner\n')
+        self.assertNotEqual(data_cleaning_cache.cache_path_for(self.input_path, self.temp_dir.name), cache_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+
+class TestDataCleaningIncremental(unittest.TestCase):
+
+    def setUp(self):
+        # Quelldatei, die zwischen zwei Läufen um weitere Zeilen ergänzt wird
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.temp_dir.name, 'verkauf.csv')
+        self.report_path = os.path.join(self.temp_dir.name, 'verkauf_bereinigt.xlsx')
+        self.df = pd.DataFrame({
+            'Datum': ['01/25/2024', '2024-02-26', None, '03-01-2024'],
+            'Verkäufer': ['Peter Schmidt', None, 'DIRK DONNER', 'Dirk Donner'],
+            'Region': ['AMERICAS', 'EMEA', None, 'ASIA'],
+            'Produkt': ['Apple iPhone 16 Pro Max', 'Samsung Galaxy S24 Ultra', 'Huawei Pura 70 Ultra',
+                        'Huawei Pura 70 Ultra'],
+            'Verkaufte Menge': [57, 29, 152, 3],
+            'Umsatz pro Einheit': [1449, 1239, 1499, 1499],
+            'Gesamtumsatz': [82593, 35931, 227848, 4497],
+            'Kommentar': [None, 'Fehlender Verkäufer', None, None]
+        })
+
+    def test_appended_rows_match_full_run(self):
+        # Zweiter Lauf verarbeitet nur die neuen Zeilen: Duplikate und fehlende Datumsangaben
+        # werden über die Laufgrenze erkannt, Report und Würfel entsprechen einem vollständigen Lauf
+        self.df.iloc[:2].to_csv(self.input_path, index=False)
+        data_cleaning_incremental.update_report(self.input_path, self.report_path, self.temp_dir.name)
+        appended = pd.concat([self.df.iloc[2:], self.df.iloc[[0]]])
+        appended.to_csv(self.input_path, mode='a', header=False, index=False)
+
+        result = data_cleaning_incremental.update_report(self.input_path, self.report_path, self.temp_dir.name)
+        self.assertTrue(result['incremental'])
+        self.assertEqual((result['rows_in'], result['rows_out'], result['rows_total']), (3, 2, 4))
+
+        expected = DataCleaningApp.clean_data(pd.read_csv(self.input_path))
+        worksheet = load_workbook(self.report_path)['Bereinigte Daten']
+        rows = list(worksheet.iter_rows(min_row=2, values_only=True))
+        self.assertEqual([row[0] for row in rows], expected['Datum'].dt.strftime('%Y-%m-%d').tolist())
+        self.assertEqual([row[1] for row in rows], expected['Verkäufer'].tolist())
+        self.assertEqual([row[6] for row in rows], expected['Gesamtumsatz'].tolist())
+
+        cubes = [data_cleaning_aggregation.build_cube(part) for part in (expected.iloc[:2], expected.iloc[2:])]
+        merged = data_cleaning_aggregation.merge_cubes(*cubes)
+        pd.testing.assert_frame_equal(merged, data_cleaning_aggregation.build_cube(expected))
+
+    def test_changed_source_rebuilds(self):
+        # Wurden bereits verarbeitete Zeilen geändert, wird der Zustand vollständig neu aufgebaut
+        self.df.to_csv(self.input_path, index=False)
+        data_cleaning_incremental.update_report(self.input_path, self.report_path, self.temp_dir.name)
+        self.df.iloc[1:].to_csv(self.input_path, index=False)
+
+        result = data_cleaning_incremental.update_report(self.input_path, self.report_path, self.temp_dir.name)
+        self.assertFalse(result['incremental'])
+        self.assertEqual(result['rows_total'], 3)
+
+    def test_changed_dedup_settings_rebuild(self):
+        # Gespeicherte Schlüssel einer anderen Schlüsselbildung werden nicht weiterverwendet
+        self.df.to_csv(self.input_path, index=False)
+        data_cleaning_incremental.update_report(self.input_path, self.report_path, self.temp_dir.name)
+        with mock.patch('data_cleaning_dedup.KEY_VERSION', data_cleaning_dedup.KEY_VERSION + 1):
+            result = data_cleaning_incremental.update_report(self.input_path, self.report_path, self.temp_dir.name)
+        self.assertFalse(result['incremental'])
+
+    def test_changed_report_rerenders(self):
+        # Ein anderes Reporting erzeugt den Report auch ohne neue Zeilen neu, dasselbe Reporting nicht
+        self.df.to_csv(self.input_path, index=False)
+        data_cleaning_incremental.update_report(self.input_path, self.report_path, self.temp_dir.name)
+        with mock.patch('data_cleaning_incremental._write_report') as write_report:
+            data_cleaning_incremental.update_report(self.input_path, self.report_path, self.temp_dir.name)
+            write_report.assert_not_called()
+            data_cleaning_incremental.update_report(self.input_path, self.report_path, self.temp_dir.name,
+                                                    report="Regionen & Produkte")
+        self.assertEqual(write_report.call_args.args[4], "Regionen & Produkte")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+
+class TestDataCleaningBenchmark(unittest.TestCase):
+
+    def test_generate_sales_data(self):
+        # Verkäufer, Regionen, Datumsformate und Duplikate sind einstellbar
+        df = data_cleaning_benchmark.generate_sales_data(1000, sellers=5, regions=4, dirty_date_ratio=0.0,
+                                                         duplicate_ratio=0.1)
+        self.assertEqual(len(df), 1100)
+        self.assertEqual(df['Verkäufer'].str.title().nunique(), 5)
+        self.assertEqual(df['Region'].nunique(), 4)
+        self.assertTrue(df['Datum'].dropna().str.match(r'\d{4}-\d{2}-\d{2}$').all())
+
+    def test_benchmark_pipeline(self):
+        # Gemessen werden nur die ausgewählten Schritte, Verlangsamungen gegenüber
+        # der Vergleichsmessung werden gemeldet
+        df = data_cleaning_benchmark.generate_sales_data(200)
+        results = data_cleaning_benchmark.benchmark_pipeline(df, ['bereinigen', 'aggregation'])
+        self.assertEqual(list(results), ['bereinigen', 'aggregation'])
+        self.assertGreater(results['bereinigen']['peak_mb'], 0)
+
+        baseline = {'200': {'bereinigen': {'seconds': results['bereinigen']['seconds'] / 10}}}
+        regressions = data_cleaning_benchmark.compare_with_baseline({'200': results}, baseline)
+        self.assertEqual(len(regressions), 1)
+
+
+class TestDataCleaningStartup(unittest.TestCase):
+
+    def test_main_module_loads_without_heavy_libraries(self):
+        # Der Import des Hauptmoduls lädt weder pandas noch matplotlib oder openpyxl
+        seconds, eager = data_cleaning_startup.measure_import(data_cleaning_startup.MAIN_MODULE,
+                                                              data_cleaning_startup.HEAVY_MODULES)
+        self.assertEqual(eager, [])
+        self.assertGreater(seconds, 0)
+
+    def test_lazy_module(self):
+        # Das Modul wird erst beim ersten Attributzugriff geladen
+        module = data_cleaning_startup.LazyModule('json')
+        self.assertIn('nicht geladen', repr(module))
+        self.assertEqual(module.dumps([1]), '[1]')
+        self.assertIn('(geladen)', repr(module))
+
+
+class TestDataCleaningRules(unittest.TestCase):
+
+    def setUp(self):
+        # Konfigurationsdatei mit Verkäuferliste als CSV-Datei, zwei Verkäufer in derselben Region
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.temp_dir.name, 'verkaeufer.csv'), 'w', encoding='utf-8') as roster:
+            roster.write("Verkäufer,Region\nAnna Neu,LATAM\nPeter Schmidt,AMERICAS\nMax Muster,AMERICAS\n")
+        self.rules_path = os.path.join(self.temp_dir.name, 'rules.json')
+        with open(self.rules_path, 'w', encoding='utf-8') as config:
+            json.dump({'sellers': 'verkaeufer.csv', 'date_formats': ['%d.%m.%Y']}, config)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_rules_from_config_file(self):
+        # Verkäufer und Datumsformate stammen aus der Konfiguration; Regionen mit mehreren
+        # Verkäufern werden nicht zum Auffüllen des Verkäufers verwendet
+        rules = data_cleaning_rules.load_rules(self.rules_path)
+        df = pd.DataFrame({
+            'Datum': ['25.01.2024', None, '27.01.2024'],
+            'Verkäufer': [None, 'anna neu', None],
+            'Region': ['LATAM', None, 'AMERICAS'],
+            'Produkt': ['A', 'B', 'C'],
+            'Verkaufte Menge': [1, 2, 3],
+            'Umsatz pro Einheit': [10, 20, 30],
+            'Gesamtumsatz': [10, 40, 90],
+            'Kommentar': [None, None, None],
+        })
+        cleaned = DataCleaningApp.clean_data(df, rules=rules)
+        self.assertEqual(cleaned['Datum'].dt.strftime('%Y-%m-%d').tolist(), ['2024-01-25', '2024-01-25', '2024-01-27'])
+        self.assertEqual(cleaned['Verkäufer'].tolist()[:2], ['Anna Neu', 'Anna Neu'])
+        self.assertTrue(pd.isna(cleaned['Verkäufer'].iloc[2]))
+        self.assertEqual(cleaned['Region'].tolist(), ['LATAM', 'LATAM', 'AMERICAS'])
+
+    def test_invalid_rule(self):
+        # Unbekannte Regeln werden beim Laden abgelehnt
+        with open(self.rules_path, 'w', encoding='utf-8') as config:
+            json.dump({'rules': [{'rule': 'unbekannt'}]}, config)
+        with self.assertRaises(ValueError):
+            data_cleaning_rules.load_rules(self.rules_path)
+
+    def test_changed_rules_invalidate_cache(self):
+        # Andere Regeln ergeben einen anderen Cache-Schlüssel
+        default_path = data_cleaning_cache.cache_path_for(self.rules_path, self.temp_dir.name)
+        with mock.patch.dict(os.environ, {data_cleaning_rules.RULES_ENV_VAR: self.rules_path}):
+            self.assertNotEqual(data_cleaning_cache.cache_path_for(self.rules_path, self.temp_dir.name), default_path)
+
+
+class TestDataCleaningDates(unittest.TestCase):
+
+    def test_detected_formats_and_report(self):
+        # Nicht konfigurierte Formate werden erkannt und gesammelt geparst, der Bericht zählt Zeilen je Format
+        dates = pd.Series(['2024-01-26', '25.12.2024', '01/25/2024', '2024-01-26', None, 'kein Datum'])
+        parsed, report = data_cleaning_dates.parse_dates(dates, ['%Y-%m-%d'])
+        self.assertEqual(parsed.dt.strftime('%Y-%m-%d').fillna('').tolist(),
+                         ['2024-01-26', '2024-12-25', '2024-01-25', '2024-01-26', '', ''])
+        self.assertEqual(report['formats'], {'%Y-%m-%d': 2, '%d.%m.%Y': 1, '%m/%d/%Y': 1})
+        self.assertEqual((report['missing'], report['unparseable']), (1, 1))
+        self.assertEqual(report['examples'], [(5, 'kein Datum')])
+
+    def test_month_first_like_pandas(self):
+        # Mehrdeutige Werte werden wie von pandas mit dem Monat zuerst gelesen, auch wenn ein
+        # eindeutiger Wert mit dem Tag zuerst im selben Muster vorangeht
+        dates = pd.Series(['25/12/2024', '01/02/2024'])
+        parsed, _ = data_cleaning_dates.parse_dates(dates)
+        self.assertEqual(parsed.dt.strftime('%Y-%m-%d').tolist(), ['2024-12-25', '2024-01-02'])
+
+    def test_clean_data_reports_dates(self):
+        # Der Bericht der Datumserkennung wird mit den bereinigten Daten weitergegeben
+        df = pd.DataFrame({'Datum': ['01/25/2024', 'kein Datum'], 'Verkäufer': ['Peter Schmidt', 'Dirk Donner'],
+                           'Region': ['AMERICAS', 'ASIA'], 'Produkt': ['A', 'B'], 'Verkaufte Menge': [1, 2],
+                           'Umsatz pro Einheit': [10, 20], 'Gesamtumsatz': [10, 40], 'Kommentar': [None, None]})
+        cleaned = DataCleaningApp.clean_data(df)
+        self.assertEqual(cleaned.attrs['date_reports']['Datum']['unparseable'], 1)
+
+
+class TestDataCleaningMemory(unittest.TestCase):
+
+    def test_compact_frame(self):
+        # Texte als Kategorien, kleinere Zahlentypen nur ohne Wertverlust, Bericht über den Speicherbedarf
+        df = pd.DataFrame({'Verkäufer': ['Peter Schmidt', 'Dirk Donner', 'Peter Schmidt', None] * 10,
+                           'Verkaufte Menge': [57, 29, 152, 3] * 10,
+                           'Umsatz pro Einheit': [1449.5, 1239.0, 1499.0, 0.1] * 10})
+        data_cleaning_memory.compact_frame(df)
+        self.assertIsInstance(df['Verkäufer'].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(df['Verkäufer'].cat.categories), ['Dirk Donner', 'Peter Schmidt'])
+        self.assertEqual(df['Verkaufte Menge'].dtype, 'int16')
+        self.assertEqual(df['Umsatz pro Einheit'].dtype, 'float64')  # 0.1 ist als float32 nicht exakt
+        self.assertLess(df.attrs['memory']['after'], df.attrs['memory']['before'])
+
+    def test_compact_pipeline(self):
+        # Blockweise gelesene Kategorien werden vereinigt, Datum als datetime64; Summen laufen nicht über
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, 'verkauf.csv')
+            pd.DataFrame({'Datum': ['01/25/2024', '2024-01-26'] * 100,
+                          'Verkäufer': ['Peter Schmidt', 'DIRK DONNER'] * 100, 'Region': ['AMERICAS', None] * 100,
+                          'Produkt': ['A', 'B'] * 100,
+                          'Verkaufte Menge': range(200), 'Umsatz pro Einheit': [100] * 200,
+                          'Gesamtumsatz': [0] * 200, 'Kommentar': [None] * 200}).to_csv(input_path, index=False)
+            with mock.patch('data_cleaning_tool.CHUNK_SIZE', 50):
+                df = DataCleaningApp.read_data(input_path, progress=lambda fraction, text: None)
+        self.assertIsInstance(df['Verkäufer'].dtype, pd.CategoricalDtype)
+        self.assertEqual(df['Verkaufte Menge'].dtype, 'int16')
+
+        cleaned = DataCleaningApp.clean_data(df)
+        self.assertTrue(pd.api.types.is_datetime64_dtype(cleaned['Datum']))
+        self.assertEqual(list(cleaned['Verkäufer'].cat.categories), ['Dirk Donner', 'Peter Schmidt'])
+        self.assertEqual(cleaned['Region'].tolist(), ['AMERICAS', 'ASIA'] * 100)
+        cube = data_cleaning_aggregation.build_cube(cleaned)
+        self.assertEqual(cube['Verkaufte Menge'].sum(), sum(range(200)))
+        self.assertEqual(cube['Gesamtumsatz'].sum(), sum(range(200)) * 100)
+
+    def test_fill_seller_from_upper_case_only(self):
+        # Fehlender Verkäufer in einer Region, deren Verkäufer nur in Großbuchstaben vorkommt (keine Kategorie)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, 'verkauf.csv')
+            pd.DataFrame({'Datum': ['2024-01-26'] * 31, 'Verkäufer': ['STEFAN BERGER'] * 30 + [None],
+                          'Region': ['EMEA'] * 30 + ['ASIA'], 'Produkt': ['A'] * 31,
+                          'Verkaufte Menge': [1] * 31, 'Umsatz pro Einheit': [100] * 31,
+                          'Gesamtumsatz': [100] * 31, 'Kommentar': [None] * 31}).to_csv(input_path, index=False)
+            df = DataCleaningApp.read_data(input_path)
+        self.assertIsInstance(df['Verkäufer'].dtype, pd.CategoricalDtype)
+        cleaned = DataCleaningApp.clean_data(df)
+        self.assertEqual(cleaned['Verkäufer'].tolist(), ['Stefan Berger', 'Dirk Donner'])
+
+    def test_header_only_file(self):
+        # Leere Zahlenspalten einer Datei ohne Datenzeilen werden nicht zu Kategorien, die Bereinigung läuft durch
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, 'leer.csv')
+            with open(input_path, 'w', encoding='utf-8') as target:
+                target.write('Datum,Verkäufer,Region,Produkt,Verkaufte Menge,Umsatz pro Einheit,'
+                             'Gesamtumsatz,Kommentar\n')
+            df = DataCleaningApp.read_data(input_path)
+        self.assertFalse(isinstance(df['Verkaufte Menge'].dtype, pd.CategoricalDtype))
+        self.assertEqual(len(DataCleaningApp.clean_data(df)), 0)
+
+
+class TestDataCleaningDedup(unittest.TestCase):
+
+    def setUp(self):
+        # Dieselbe Zeile in unterschiedlicher Schreibweise (Datumsformat, Groß-/Kleinschreibung)
+        self.df = pd.DataFrame({
+            'Datum': ['01/25/2024', '2024-01-25', '2024-01-26'],
+            'Verkäufer': ['Peter Schmidt', 'PETER SCHMIDT', 'Dirk Donner'],
+            'Region': ['EMEA', 'EMEA', 'ASIA'],
+            'Produkt': ['Apple iPhone 16 Pro Max'] * 3,
+            'Verkaufte Menge': [57, 57, 152],
+            'Umsatz pro Einheit': [1449, 1449, 1499],
+            'Gesamtumsatz': [82593, 82593, 227848],
+            'Kommentar': ['a', 'b', None],
+        })
+
+    def test_normalized_duplicates(self):
+        # Duplikate werden nach dem Parsen der Datumsangaben und der Namensnormalisierung erkannt
+        cleaned = DataCleaningApp.clean_data(self.df)
+        self.assertEqual(len(cleaned), 2)
+        self.assertEqual(cleaned.attrs['duplicates'], {'rows': 3, 'duplicates': 1, 'known': 0})
+
+    def test_keys_across_files_and_runs(self):
+        # Über den gespeicherten Schlüsselindex werden Zeilen früherer Dateien bzw. Läufe als bekannt entfernt
+        with tempfile.TemporaryDirectory() as temp_dir:
+            keys_path = os.path.join(temp_dir, 'keys.npy')
+            key_index = data_cleaning_dedup.KeyIndex.load(keys_path)
+            DataCleaningApp.clean_data(self.df.iloc[:1].copy(), key_index=key_index)
+            key_index.save(keys_path)
+
+            key_index = data_cleaning_dedup.KeyIndex.load(keys_path)
+            cleaned = DataCleaningApp.clean_data(self.df.iloc[1:].copy(), key_index=key_index)
+        self.assertEqual(cleaned['Verkäufer'].tolist(), ['Dirk Donner'])
+        self.assertEqual(cleaned.attrs['duplicates'], {'rows': 2, 'duplicates': 0, 'known': 1})
+        self.assertEqual(len(key_index), 2)
+        self.assertIn("davon 1 aus anderen Dateien", data_cleaning_dedup.describe_report(cleaned.attrs['duplicates']))
+
+    def test_key_index_small_batches(self):
+        # Viele kleine Blöcke ergeben dieselbe sortierte Menge wie ein einziger, mit höchstens log2(n) Teilen
+        keys = np.random.default_rng(0).permutation(np.arange(1000, dtype=np.uint64) * 7)
+        key_index = data_cleaning_dedup.KeyIndex()
+        for start in range(0, len(keys), 10):
+            batch = keys[start:start + 10]
+            self.assertFalse(key_index.contains(batch).any())
+            key_index.add(batch)
+        self.assertLessEqual(len(key_index.runs), 10)
+        self.assertTrue(key_index.contains(keys).all())
+        self.assertFalse(key_index.contains(keys + np.uint64(1)).any())
+        np.testing.assert_array_equal(key_index.keys, np.sort(keys))
+
+    def test_cli_reports_duplicates_per_file(self):
+        # Kommandozeile mit --dedup-keys: die zweite Datei enthält nur bereits bekannte Zeilen
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.df.to_csv(os.path.join(temp_dir, 'a.csv'), index=False)
+            self.df.iloc[:2].to_csv(os.path.join(temp_dir, 'b.csv'), index=False)
+            keys_path = os.path.join(temp_dir, 'keys.npy')
+            arguments = [os.path.join(temp_dir, 'a.csv'), os.path.join(temp_dir, 'b.csv'),
+                         '-o', os.path.join(temp_dir, 'out'), '--chunk-size', '1', '--dedup-keys', keys_path,
+                         '--no-run-log']
+            with mock.patch('builtins.print') as printed:
+                self.assertEqual(data_cleaning_cli.main(arguments), 0)
+            lines = [call.args[0] for call in printed.call_args_list]
+            self.assertEqual(len(data_cleaning_dedup.KeyIndex.load(keys_path)), 2)
+        self.assertIn("1 doppelte Zeilen entfernt", lines[0])
+        self.assertIn("2 doppelte Zeilen entfernt (davon 1 aus anderen Dateien", lines[1])
+
+
+class TestDataCleaningExcel(unittest.TestCase):
+
+    def setUp(self):
+        # Regionale Arbeitsmappe mit einem Blatt je Region und eine zweite Datei mit einem Blatt
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame({
+            'Datum': ['01/25/2024', '2024-01-26'],
+            'Verkäufer': ['Peter Schmidt', 'Dirk Donner'],
+            'Region': ['EMEA', 'ASIA'],
+            'Produkt': ['Apple iPhone 16 Pro Max', 'Huawei Pura 70 Ultra'],
+            'Verkaufte Menge': [57, 152],
+            'Umsatz pro Einheit': [1449, 1499],
+            'Gesamtumsatz': [82593, 227848],
+            'Kommentar': [None, 'Test'],
+        })
+        self.regions_path = os.path.join(self.temp_dir.name, 'regionen.xlsx')
+        with pd.ExcelWriter(self.regions_path) as writer:
+            self.df.iloc[:1].to_excel(writer, sheet_name='EMEA', index=False)
+            self.df.iloc[1:].to_excel(writer, sheet_name='ASIA', index=False)
+            pd.DataFrame().to_excel(writer, sheet_name='Leer', index=False)
+        self.single_path = os.path.join(self.temp_dir.name, 'einzeln.xlsx')
+        self.df.to_excel(self.single_path, index=False)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_all_sheets_with_source(self):
+        # Alle Blätter aller Dateien, parallel wie nacheinander gelesen, mit Datei und Blatt in der Spalte Quelle
+        parallel = data_cleaning_excel.read_workbooks([self.regions_path, self.single_path], workers=2)
+        sequential = data_cleaning_excel.read_workbooks([self.regions_path, self.single_path], workers=1)
+        pd.testing.assert_frame_equal(parallel, sequential)
+        self.assertEqual(parallel[data_cleaning_excel.SOURCE_COLUMN].tolist(),
+                         ['regionen.xlsx / EMEA', 'regionen.xlsx / ASIA', 'einzeln.xlsx / Sheet1',
+                          'einzeln.xlsx / Sheet1'])
+        self.assertEqual(parallel['Verkaufte Menge'].tolist(), [57, 152, 57, 152])
+        self.assertEqual(len(DataCleaningApp.clean_data(parallel)), 2)
+
+    def test_single_sheet_matches_read_excel(self):
+        # Eine Datei mit einem Blatt ergibt dieselben Daten wie pd.read_excel, ohne Spalte Quelle
+        df = DataCleaningApp.read_data(self.single_path)
+        self.assertNotIn(data_cleaning_excel.SOURCE_COLUMN, df)
+        expected = data_cleaning_memory.compact_frame(pd.read_excel(self.single_path))
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_mismatched_columns(self):
+        # Blätter mit abweichenden Spalten werden mit Angabe des Blatts abgelehnt
+        other_path = os.path.join(self.temp_dir.name, 'anders.xlsx')
+        self.df.drop(columns='Kommentar').to_excel(other_path, index=False)
+        with self.assertRaisesRegex(ValueError, "anders.xlsx / Sheet1"):
+            data_cleaning_excel.read_workbooks([self.single_path, other_path], workers=1)
+
+
+class TestDataCleaningServer(unittest.TestCase):
+
+    def setUp(self):
+        # Dienst auf einem freien Port mit eigenem Verzeichnis und Cache
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.service = data_cleaning_server.ReportService(os.path.join(self.temp_dir.name, 'server'),
+                                                          os.path.join(self.temp_dir.name, 'cache'), workers=2)
+        self.server = data_cleaning_server.ReportServer(('127.0.0.1', 0), self.service, quiet=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.csv = pd.DataFrame({
+            'Datum': ['01/25/2024', '2024-01-26', '2024-02-27'],
+            'Verkäufer': ['Peter Schmidt', 'STEFAN BERGER', 'Dirk Donner'],
+            'Region': [None, 'EMEA', 'ASIA'],
+            'Produkt': ['Apple iPhone 16 Pro Max', 'Samsung Galaxy S24 Ultra', 'Huawei Pura 70 Ultra'],
+            'Verkaufte Menge': [57, 29, 152],
+            'Umsatz pro Einheit': [1449, 1239, 1499],
+            'Gesamtumsatz': [82593, 35931, 227848],
+            'Kommentar': [None, None, None],
+        }).to_csv(index=False).encode('utf-8')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.close()
+        self.temp_dir.cleanup()
+
+    def _request(self, path, data=None):
+        request = urllib.request.Request(self.base_url + path, data=data, method='POST' if data else 'GET')
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+            return response.status, json.loads(body) if response.headers.get_content_type() == 'application/json' \
+                else body
+
+    def _upload(self, name='verkauf.csv', report=data_cleaning_server.DEFAULT_REPORT):
+        return self._request(f"/reports?name={name}&report={urllib.parse.quote(report)}", self.csv)
+
+    def test_upload_and_download(self):
+        # Hochladen, Warten auf den fertigen Report und Herunterladen der Excel-Datei
+        status, job = self._upload()
+        self.assertEqual(status, 202)
+        _, job = self._request(f"{job['url']}?wait=30")
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['result']['rows_out'], 3)
+        _, content = self._request(job['download'])
+        self.assertTrue(content.startswith(b'PK'))  # Excel-Dateien sind ZIP-Archive
+
+    def test_identical_inputs_use_cache(self):
+        # Gleiche Datei und gleiches Reporting ergeben denselben Auftrag, ein anderes Reporting bereinigt nicht neu
+        _, first = self._upload()
+        _, second = self._upload(name='kopie.csv')
+        self.assertEqual(first['id'], second['id'])
+        self._request(f"{first['url']}?wait=30")
+        status, again = self._upload()
+        self.assertEqual((status, again['status']), (200, 'done'))
+
+        _, other = self._upload(report="Regionen & Produkte")
+        self.assertNotEqual(other['id'], first['id'])
+        _, other = self._request(f"{other['url']}?wait=30")
+        self.assertTrue(other['result']['cached'])
+
+    def test_failed_result_ends_job(self):
+        # Fehler beim Speichern des Ergebnisses schließen den Auftrag mit Fehler ab, statt ihn laufen zu lassen
+        with mock.patch('data_cleaning_cli.process_file', return_value={'rows_out': object()}):
+            _, job = self._upload()
+            _, job = self._request(f"{job['url']}?wait=30")
+        self.assertEqual(job['status'], 'error')
+        self.assertIn('TypeError', job['error'])
+        self.assertFalse(os.path.exists(os.path.join(self.service.directory, job['id'], 'result.json')))
+        _, job = self._request(f"{job['url']}?wait=nan")
+        self.assertEqual(job['status'], 'error')
+
+    def test_rejected_requests(self):
+        # Nicht unterstützte Dateitypen und unbekannte Aufträge
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self._upload(name='verkauf.txt')
+        self.assertEqual(context.exception.code, 400)
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self._request('/reports/0123456789abcdef01234567')
+        self.assertEqual(context.exception.code, 404)
+
+
+class TestDataCleaningTelemetry(unittest.TestCase):
+
+    def setUp(self):
+        # Eine doppelte Zeile, eine fehlende Region und ein fehlendes Datum
+        self.df = pd.DataFrame({
+            'Datum': ['01/25/2024', '01/25/2024', None],
+            'Verkäufer': ['Peter Schmidt', 'Peter Schmidt', 'Dirk Donner'],
+            'Region': [None, None, 'ASIA'],
+            'Produkt': ['Apple iPhone 16 Pro Max'] * 2 + ['Huawei Pura 70 Ultra'],
+            'Verkaufte Menge': [57, 57, 152],
+            'Umsatz pro Einheit': [1449, 1449, 1499],
+            'Gesamtumsatz': [82593, 82593, 227848],
+            'Kommentar': [None, None, None],
+        })
+
+    def test_cleaning_sub_steps(self):
+        # Jeder Teilschritt der Bereinigung mit Dauer, Zeilen und fehlenden Werten vor und nach dem Schritt
+        cleaned = DataCleaningApp.clean_data(self.df)
+        stages = {record['stage']: record for record in cleaned.attrs['stages']}
+        self.assertEqual(list(stages)[:5], ['duplikate', 'parse_dates Datum', 'fill_forward Datum',
+                                            'fill_from_lookup Verkäufer', 'title_case Verkäufer'])
+        self.assertEqual((stages['duplikate']['rows_in'], stages['duplikate']['rows_dropped']), (3, 1))
+        self.assertEqual((stages['fill_forward Datum']['missing_before'],
+                          stages['fill_forward Datum']['missing_after']), (1, 0))
+        self.assertEqual(stages['fill_from_lookup Region']['missing_after'], 0)
+        self.assertTrue(all(record['seconds'] >= 0 for record in stages.values()))
+        self.assertIn("duplikate", data_cleaning_telemetry.describe_stages(cleaned.attrs['stages'], limit=10))
+
+    def test_memory_without_current_value(self):
+        # Ohne aktuellen Arbeitsspeicher (macOS) wird der Anstieg des Höchstwerts getrennt ausgewiesen
+        run_log = data_cleaning_telemetry.RunLog()
+        with mock.patch('data_cleaning_telemetry.resident_bytes', return_value=None):
+            with mock.patch('data_cleaning_telemetry.peak_resident_bytes', side_effect=[100, 250]):
+                with run_log.stage('laden'):
+                    pass
+        self.assertIsNone(run_log.stages[0]['memory_delta'])
+        self.assertEqual(run_log.stages[0]['memory_peak_delta'], 150)
+
+    def test_run_log_written_by_cli(self):
+        # Die Stapelverarbeitung schreibt je Datei eine JSON-Zeile mit Haupt- und Teilschritten
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, 'verkauf.csv')
+            self.df.to_csv(input_path, index=False)
+            run_log_path = os.path.join(temp_dir, 'runs.jsonl')
+            with mock.patch('builtins.print'):
+                data_cleaning_cli.main([input_path, '-o', os.path.join(temp_dir, 'out'), '--no-cache',
+                                        '--run-log', run_log_path, '--workers', '1'])
+            with open(run_log_path, encoding='utf-8') as source:
+                runs = [json.loads(line) for line in source]
+        self.assertEqual(len(runs), 1)
+        stages = runs[0]['stages']
+        self.assertEqual([record['stage'] for record in stages if record['parent'] is None],
+                         ['laden', 'bereinigen', 'aggregation', 'report'])
+        self.assertEqual({record['stage'] for record in stages if record['parent'] == 'report'},
+                         {'diagramme', 'spaltenbreiten', 'export'})
+        cleaning = next(record for record in stages if record['stage'] == 'bereinigen')
+        self.assertEqual((cleaning['rows_in'], cleaning['rows_out'], cleaning['rows_dropped']), (3, 2, 1))
+
+
 if __name__ == '__main__':
     unittest.main()